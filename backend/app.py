@@ -1,6 +1,6 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, verify_jwt_in_request
 from config import Config
 from routes.auth import auth_bp
 from routes.donors import donor_bp
@@ -8,19 +8,44 @@ from routes.volunteers import volunteers_bp
 from routes.users import users_bp
 from routes.students import student_bp
 from routes.graphql import graphql_bp  # Add this import
+from routes.imports import imports_bp
+from routes.exports import exports_bp
 from models import initialize_db
+from config.database import mongo
+from services.indexes import ensure_indexes
+from cli import register_commands
+from services.passwords import password_hasher, PasswordHasherBusy
+from utils.metrics import collect_metrics
+from utils.formats import APIRequest, NegotiatingJSONProvider
+from utils.compression import compression
+from utils.response_cache import response_cache
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # orjson-backed jsonify/get_json that understands ObjectId and Decimal128,
+    # with MessagePack/BSON negotiated from the Accept and Content-Type headers
+    app.request_class = APIRequest
+    app.json = NegotiatingJSONProvider(app)
+
     # Initialize MongoDB connection
     initialize_db(app)
 
+    # Optionally make sure the indexes the routes depend on exist
+    if app.config.get('MONGODB_ENSURE_INDEXES'):
+        try:
+            ensure_indexes(mongo.db)
+        except Exception as e:
+            app.logger.warning("Could not ensure MongoDB indexes: %s", e)
+
     # Initialize extensions
     CORS(app)
     JWTManager(app)
+    password_hasher.init_app(app)
+    compression.init_app(app)
+    response_cache.init_app(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -29,6 +54,12 @@ def create_app():
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(student_bp, url_prefix='/api/students')
     app.register_blueprint(graphql_bp, url_prefix='/api')  # Add this line
+    app.register_blueprint(imports_bp, url_prefix='/api/imports')
+    app.register_blueprint(exports_bp, url_prefix='/api/exports')
+
+    # CLI commands (flask db ensure-indexes | index-report | migrate-legacy-collections |
+    # import | export | rebuild-inventory)
+    register_commands(app)
 
     # Root endpoint
     @app.route('/')
@@ -40,6 +71,20 @@ def create_app():
     def health():
         return jsonify({"status": "healthy", "database": "connected"})
 
+    # Per-worker runtime metrics (JWT required unless METRICS_PUBLIC is set)
+    @app.route('/metrics')
+    def metrics():
+        if not app.config.get('METRICS_PUBLIC'):
+            verify_jwt_in_request()
+        return jsonify(collect_metrics())
+
+    # Password hashing pool saturated: ask the client to back off
+    @app.errorhandler(PasswordHasherBusy)
+    def hasher_busy(error):
+        response = jsonify({"message": "Too many authentication requests, please retry shortly"})
+        response.headers['Retry-After'] = '1'
+        return response, 429
+
     # 404 handler
     @app.errorhandler(404)
     def not_found(error):
@@ -0,0 +1,105 @@
+# async_execution.py
+"""Concurrent execution of independent GraphQL root fields.
+
+The resolvers in schema.py are synchronous (mongoengine/PyMongo). Under
+``graphql_sync`` a query like ``{ donors { ... } volunteers { ... } }``
+resolves its root fields one after the other. Here each root field is
+resolved on a thread pool and the operation runs on graphql-core's async
+executor, which gathers the root fields concurrently, so latency follows
+the slowest field rather than the sum. Mutations are still executed
+serially, as the spec requires, and a query with a single root field has
+nothing to overlap; ``runs_concurrently`` tells callers to execute those
+synchronously instead.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from inspect import isawaitable
+
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode, execute, get_operation_ast
+from graphql.language import FragmentDefinitionNode, OperationType
+
+
+class ThreadPoolResolverMiddleware:
+    """Runs root-field resolvers on a thread pool and returns awaitables."""
+
+    def __init__(self, max_workers=8):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.max_workers = max_workers
+
+    def configure(self, max_workers):
+        self.shutdown()
+        self.max_workers = max_workers
+
+    def resolve(self, next, root, info, **args):
+        if info.path.prev is not None:
+            # Nested fields just read attributes of already-loaded documents
+            return next(root, info, **args)
+        loop = asyncio.get_running_loop()
+        # Carry the Flask app/request context into the worker thread
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, next, root, info, **args)
+        return loop.run_in_executor(self._get_executor(), call)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._pid = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='graphql'
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+
+resolver_pool = ThreadPoolResolverMiddleware()
+
+
+def _root_response_keys(selection_set, fragments, keys, visited):
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            keys.add((selection.alias or selection.name).value)
+        elif isinstance(selection, InlineFragmentNode):
+            _root_response_keys(selection.selection_set, fragments, keys, visited)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in fragments and name not in visited:
+                visited.add(name)
+                _root_response_keys(fragments[name].selection_set, fragments, keys, visited)
+    return keys
+
+
+def runs_concurrently(document, operation_name=None):
+    """Whether the selected operation is a query with more than one root field."""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return False
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions if isinstance(definition, FragmentDefinitionNode)
+    }
+    return len(_root_response_keys(operation.selection_set, fragments, set(), set())) > 1
+
+
+def execute_concurrently(schema, document, **kwargs):
+    """Execute ``document`` on a private event loop and return the result."""
+
+    async def run():
+        result = execute(schema, document, middleware=[resolver_pool], **kwargs)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    return asyncio.run(run())
@@ -0,0 +1,145 @@
+# cli.py
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from config.database import mongo
+from services.indexes import ensure_indexes, collscan_report
+from services.inventory import donor_inventory
+from services.importer import (
+    SCHEMAS as IMPORT_SCHEMAS, ImportFormatError, RejectsWriter, detect_format, iter_rows, run_import
+)
+from services.export import (
+    COLUMNS as EXPORT_COLUMNS, FORMATS as EXPORT_FORMATS, ExportError, arrow_schema, build_query,
+    detect_format as detect_export_format, iter_record_batches, select_columns, write_export
+)
+from utils.conditional import bump_version
+
+db_cli = AppGroup('db', help='Database maintenance commands.')
+
+# Collections the blueprints used to reach as ``<database>.db.<name>``
+LEGACY_COLLECTIONS = ('donors', 'volunteers', 'students', 'users')
+
+
+@db_cli.command('ensure-indexes')
+def ensure_indexes_command():
+    """Create the indexes declared for the models and raw collections."""
+    for collection, names in ensure_indexes(mongo.db).items():
+        click.echo(f"{collection}: {', '.join(names)}")
+
+
+@db_cli.command('index-report')
+@click.option('--fail-on-collscan', is_flag=True,
+              help='Exit with status 1 if any route query scans a collection.')
+def index_report_command(fail_on_collscan):
+    """Explain the queries issued by the routes and flag collection scans."""
+    report = collscan_report(mongo.db)
+    for entry in report:
+        status = 'COLLSCAN' if entry['collscan'] else 'ok'
+        click.echo(f"[{status:8}] {entry['route']} on {entry['collection']}: {' > '.join(entry['stages'])}")
+
+    scans = [entry for entry in report if entry['collscan']]
+    click.echo(f"{len(scans)} of {len(report)} route queries run as a COLLSCAN")
+    if scans and fail_on_collscan:
+        raise SystemExit(1)
+
+
+@db_cli.command('migrate-legacy-collections')
+def migrate_legacy_collections_command():
+    """Rename the old 'db.<name>' collections to '<name>'."""
+    existing = set(mongo.db.list_collection_names())
+    for name in LEGACY_COLLECTIONS:
+        legacy = f"db.{name}"
+        if legacy not in existing:
+            continue
+        if name in existing:
+            click.echo(f"Skipping {legacy}: {name} already exists, merge it manually")
+            continue
+        mongo.db[legacy].rename(name)
+        bump_version(name)
+        click.echo(f"Renamed {legacy} -> {name}")
+
+@db_cli.command('import')
+@click.argument('kind', type=click.Choice(sorted(IMPORT_SCHEMAS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'xlsx']),
+              help='File format; guessed from the extension by default.')
+@click.option('--batch-size', type=int, help='Rows per insert (default IMPORT_BATCH_SIZE).')
+@click.option('--rejects', type=click.Path(dir_okay=False),
+              help='CSV report of rejected rows (default <path>.rejected.csv).')
+def import_command(kind, path, fmt, batch_size, rejects):
+    """Import donors or volunteers from a CSV or XLSX spreadsheet."""
+    try:
+        fmt = detect_format(path, fmt)
+    except ImportFormatError as e:
+        raise click.ClickException(str(e))
+    batch_size = batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+    rejects = rejects or f"{path}.rejected.csv"
+
+    with open(path, 'rb') as source, open(rejects, 'w', newline='', encoding='utf-8') as report:
+        writer = RejectsWriter(report)
+        try:
+            for event in run_import(mongo.db[kind], iter_rows(source, fmt), kind, batch_size):
+                if event['event'] == 'rejected':
+                    writer.write(event)
+                elif event['event'] == 'progress':
+                    rate = event['rows'] / event['seconds'] if event['seconds'] else 0
+                    click.echo(f"{event['rows']} rows: {event['imported']} imported, "
+                               f"{event['rejected']} rejected ({rate:.0f} rows/s)")
+        except ImportFormatError as e:
+            raise click.ClickException(str(e))
+        finally:
+            # Once for the whole file; batches already written stay even if it fails
+            bump_version(kind)
+
+    click.echo(f"Imported {event['imported']} of {event['rows']} rows in {event['seconds']}s, "
+               f"{event['rejected']} rejected")
+    if event['rejected']:
+        click.echo(f"Rejected rows written to {rejects}")
+    else:
+        os.remove(rejects)
+
+
+@db_cli.command('rebuild-inventory')
+def rebuild_inventory_command():
+    """Recompute the donor counts per district and blood type.
+
+    Donor writes made while this runs are overwritten; run it when donors
+    are not being edited.
+    """
+    pairs = donor_inventory.rebuild(mongo.db)
+    bump_version('donors')
+    click.echo(f"Rebuilt donor inventory: {pairs} district/blood type pairs")
+
+
+@db_cli.command('export')
+@click.argument('kind', type=click.Choice(sorted(EXPORT_COLUMNS)))
+@click.argument('path', type=click.Path(dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(sorted(EXPORT_FORMATS)),
+              help='Output format; guessed from the extension by default.')
+@click.option('--columns', help='Comma-separated columns to export (default: all).')
+@click.option('--district', help='Only documents from this district.')
+@click.option('--blood-type', help='Only donors of this blood type.')
+@click.option('--since', help='Only documents with timeanddate >= this ISO date.')
+@click.option('--until', help='Only documents with timeanddate < this ISO date.')
+@click.option('--batch-size', type=int, help='Rows per record batch (default EXPORT_BATCH_SIZE).')
+def export_command(kind, path, fmt, columns, district, blood_type, since, until, batch_size):
+    """Export donors, volunteers or students to a Parquet or Feather file."""
+    try:
+        fmt = detect_export_format(path, fmt)
+        columns = select_columns(kind, columns.split(',') if columns else None)
+        query = build_query(kind, district=district, blood_type=blood_type, since=since, until=until)
+        schema = arrow_schema(columns)
+    except ExportError as e:
+        raise click.ClickException(str(e))
+    batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', 10000)
+
+    batches = iter_record_batches(mongo.db[kind], columns, query, batch_size)
+    rows = write_export(batches, schema, path, fmt, on_batch=lambda rows: click.echo(f"{rows} rows written"))
+    click.echo(f"Exported {rows} {kind} to {path}")
+
+
+def register_commands(app):
+    app.cli.add_command(db_cli)
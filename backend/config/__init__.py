@@ -3,9 +3,99 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _int_env(name, default=None):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+def _bool_env(name):
+    value = os.environ.get(name)
+    return value.lower() in ['1', 'true', 'yes'] if value not in (None, '') else None
+
+def _write_concern_env(name):
+    value = os.environ.get(name) or None
+    return int(value) if value is not None and value.isdigit() else value
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-here'
     MONGODB_DB = os.environ.get('MONGODB_DB') or 'food2'
     MONGODB_URI = os.environ.get('MONGODB_URI') or 'mongodb://localhost:27017/food2'
-    DEBUG = os.environ.get('FLASK_DEBUG') or False
\ No newline at end of file
+    DEBUG = os.environ.get('FLASK_DEBUG') or False
+
+    # Pool and timeout settings for the shared MongoClient (config/database.py)
+    MONGODB_MAX_POOL_SIZE = _int_env('MONGODB_MAX_POOL_SIZE', 100)
+    MONGODB_MIN_POOL_SIZE = _int_env('MONGODB_MIN_POOL_SIZE', 0)
+    MONGODB_MAX_IDLE_TIME_MS = _int_env('MONGODB_MAX_IDLE_TIME_MS', 60000)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS = _int_env('MONGODB_WAIT_QUEUE_TIMEOUT_MS')
+    MONGODB_CONNECT_TIMEOUT_MS = _int_env('MONGODB_CONNECT_TIMEOUT_MS', 10000)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS = _int_env('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 10000)
+    MONGODB_SOCKET_TIMEOUT_MS = _int_env('MONGODB_SOCKET_TIMEOUT_MS')
+    MONGODB_READ_PREFERENCE = os.environ.get('MONGODB_READ_PREFERENCE') or 'primary'
+    MONGODB_WRITE_CONCERN = _write_concern_env('MONGODB_WRITE_CONCERN')
+    MONGODB_JOURNAL = _bool_env('MONGODB_JOURNAL')
+
+    # bcrypt work factor for new hashes; logins rehash hashes with another cost
+    BCRYPT_LOG_ROUNDS = _int_env('BCRYPT_LOG_ROUNDS', 12)
+
+    # Process pool for bcrypt hashing/verification (0 workers = inline). Each
+    # gunicorn worker has its own pool, see gunicorn.conf.py for the host total
+    PASSWORD_HASHER_WORKERS = _int_env('PASSWORD_HASHER_WORKERS', 1)
+    PASSWORD_HASHER_MAX_PENDING = _int_env('PASSWORD_HASHER_MAX_PENDING', 8)
+    PASSWORD_HASHER_TIMEOUT = float(os.environ.get('PASSWORD_HASHER_TIMEOUT', 10))
+
+    # GraphQL parsed-document LRU and persisted queries (JSON manifest of sha256 -> query)
+    GRAPHQL_DOCUMENT_CACHE_SIZE = _int_env('GRAPHQL_DOCUMENT_CACHE_SIZE', 512)
+    GRAPHQL_PERSISTED_QUERY_CACHE_SIZE = _int_env('GRAPHQL_PERSISTED_QUERY_CACHE_SIZE', 1024)
+    GRAPHQL_PERSISTED_QUERIES_FILE = os.environ.get('GRAPHQL_PERSISTED_QUERIES_FILE')
+
+    # Static GraphQL cost analysis: reject operations above these limits
+    GRAPHQL_MAX_COST = _int_env('GRAPHQL_MAX_COST', 5000)
+    GRAPHQL_MAX_DEPTH = _int_env('GRAPHQL_MAX_DEPTH', 10)
+
+    # Resolve independent GraphQL root fields concurrently on a thread pool
+    GRAPHQL_ASYNC_EXECUTION = os.environ.get('GRAPHQL_ASYNC_EXECUTION', '1').lower() in ['1', 'true', 'yes']
+    GRAPHQL_ASYNC_WORKERS = _int_env('GRAPHQL_ASYNC_WORKERS', 8)
+
+    # Response compression (br/zstd used when the brotli/zstandard packages are installed)
+    COMPRESS_MIN_SIZE = _int_env('COMPRESS_MIN_SIZE', 1024)
+    COMPRESS_GZIP_LEVEL = _int_env('COMPRESS_GZIP_LEVEL', 6)
+    COMPRESS_BR_LEVEL = _int_env('COMPRESS_BR_LEVEL', 4)
+    COMPRESS_ZSTD_LEVEL = _int_env('COMPRESS_ZSTD_LEVEL', 3)
+    COMPRESS_ALGORITHMS = (os.environ.get('COMPRESS_ALGORITHMS') or 'br,zstd,gzip').split(',')
+
+    # Cache for GET responses, keyed by collection write version (Redis-compatible URL to share across workers)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', '1').lower() in ['1', 'true', 'yes']
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_MAX_ENTRIES = _int_env('RESPONSE_CACHE_MAX_ENTRIES', 1024)
+    RESPONSE_CACHE_MAX_BYTES = _int_env('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+    RESPONSE_CACHE_MAX_ITEM_BYTES = _int_env('RESPONSE_CACHE_MAX_ITEM_BYTES', 1024 * 1024)
+    RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL')
+
+    # Documents per insert_many/bulk_write call in the /bulk endpoints
+    BULK_CHUNK_SIZE = _int_env('BULK_CHUNK_SIZE', 500)
+
+    # Rows per insert for spreadsheet imports (flask db import, POST /api/imports/<kind>)
+    IMPORT_BATCH_SIZE = _int_env('IMPORT_BATCH_SIZE', 1000)
+
+    # Documents per Arrow record batch for Parquet/Feather exports
+    EXPORT_BATCH_SIZE = _int_env('EXPORT_BATCH_SIZE', 10000)
+
+    # Serve /metrics without a JWT (e.g. for a scraper on a private network)
+    METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', '0').lower() in ['1', 'true', 'yes']
+
+    # Create declared indexes when the app starts (also: flask db ensure-indexes)
+    MONGODB_ENSURE_INDEXES = os.environ.get('MONGODB_ENSURE_INDEXES', '0').lower() in ['1', 'true', 'yes']
+
+    # Days before a donor is eligible again, per donation type
+    DONATION_DEFERRAL_DAYS = {
+        'whole_blood': _int_env('DONATION_DEFERRAL_DAYS_WHOLE_BLOOD', 90),
+        'platelets': _int_env('DONATION_DEFERRAL_DAYS_PLATELETS', 7),
+        'plasma': _int_env('DONATION_DEFERRAL_DAYS_PLASMA', 14),
+    }
+
+    # Keyset pagination for list endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', 50))
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', 500))
+
+    # Cursor batch size for NDJSON streaming of full collections
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 1000))
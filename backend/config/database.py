@@ -1,10 +1,131 @@
 # config/database.py
-from pymongo import MongoClient
 import os
+import threading
+
+from mongoengine import DEFAULT_CONNECTION_NAME, disconnect, register_connection
+from mongoengine import connection as mongoengine_connection
+from pymongo import MongoClient
+
+
+def client_options(config):
+    """Build MongoClient keyword arguments from the MONGODB_* config keys."""
+    options = {
+        'maxPoolSize': config.get('MONGODB_MAX_POOL_SIZE'),
+        'minPoolSize': config.get('MONGODB_MIN_POOL_SIZE'),
+        'maxIdleTimeMS': config.get('MONGODB_MAX_IDLE_TIME_MS'),
+        'waitQueueTimeoutMS': config.get('MONGODB_WAIT_QUEUE_TIMEOUT_MS'),
+        'connectTimeoutMS': config.get('MONGODB_CONNECT_TIMEOUT_MS'),
+        'serverSelectionTimeoutMS': config.get('MONGODB_SERVER_SELECTION_TIMEOUT_MS'),
+        'socketTimeoutMS': config.get('MONGODB_SOCKET_TIMEOUT_MS'),
+        'readPreference': config.get('MONGODB_READ_PREFERENCE'),
+        'w': config.get('MONGODB_WRITE_CONCERN'),
+        'journal': config.get('MONGODB_JOURNAL'),
+        'uuidRepresentation': 'standard',
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+class MongoConnection:
+    """Owns the one MongoClient (and its pool) used by the whole process.
+
+    The blueprints address collections through ``mongo.db.<collection>`` and
+    mongoengine is registered with ``mongo.get_client`` as its client class,
+    so both share the same sockets and pool settings.
+
+    The client is created lazily on first use and remembers the pid that
+    created it. A process forked after the client was opened (e.g. a
+    pre-forking server with ``preload_app``) gets a fresh client of its own.
+    The inherited one is dropped without being closed: closing it in the
+    child would take its locks and talk over the parent's sockets.
+    """
+
+    def __init__(self, uri=None, db_name=None, **options):
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._aliases = set()
+        self.configure(uri, db_name, **options)
+
+    def configure(self, uri, db_name, **options):
+        """Replace the connection settings, closing any existing client."""
+        self._disconnect()
+        self.uri = uri or 'mongodb://localhost:27017/'
+        self.db_name = db_name or 'food2'
+        self.options = options
+        self._register_aliases()
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('MONGODB_URI'),
+            app.config.get('MONGODB_DB'),
+            **client_options(app.config)
+        )
+        app.extensions['mongo'] = self
+
+    def register_mongoengine(self, alias=DEFAULT_CONNECTION_NAME):
+        """Register a mongoengine alias that lazily uses the shared client."""
+        self._aliases.add(alias)
+        disconnect(alias)
+        register_connection(
+            alias,
+            db=self.db_name,
+            host=self.uri,
+            mongo_client_class=self.get_client,
+            uuidRepresentation='standard'
+        )
+
+    @property
+    def client(self):
+        if self._client is not None and self._pid != os.getpid():
+            # Inherited across fork(); never share sockets with the parent
+            self._forget()
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = MongoClient(self.uri, **self.options)
+                    self._pid = os.getpid()
+        return self._client
+
+    def get_client(self, *args, **kwargs):
+        """Client factory handed to mongoengine; ignores its connection kwargs."""
+        return self.client
+
+    @property
+    def db(self):
+        return self.client[self.db_name]
+
+    def close(self):
+        """Close the client and its pool; the next use opens a new one."""
+        self._disconnect()
+        self._register_aliases()
+
+    def _disconnect(self):
+        # mongoengine caches the client it was handed, so drop its aliases too
+        for alias in self._aliases:
+            disconnect(alias)
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._pid = None
+
+    def _forget(self):
+        # The lock may have been held by another parent thread at fork time
+        self._lock = threading.Lock()
+        for alias in self._aliases:
+            # Removed first so disconnect() finds no client to close
+            mongoengine_connection._connections.pop(alias, None)
+        self._client = None
+        self._pid = None
+        self._register_aliases()
+
+    def _register_aliases(self):
+        for alias in list(self._aliases):
+            self.register_mongoengine(alias)
 
-# Use environment variable or default to local MongoDB
-MONGODB_URI = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
-DB_NAME = os.environ.get('MONGODB_DB', 'food2')
 
-client = MongoClient(MONGODB_URI)
-mongo = client[DB_NAME]
\ No newline at end of file
+# Use environment variable or default to local MongoDB until an app configures it
+mongo = MongoConnection(
+    os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/'),
+    os.environ.get('MONGODB_DB', 'food2')
+)
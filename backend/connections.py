@@ -0,0 +1,55 @@
+# connections.py
+"""Keyset-paginated Relay connections for the GraphQL list fields.
+
+Cursors are the same opaque ``_id`` encoding the REST list routes use
+(``utils.pagination``), so a page is always an ``_id > after`` range scan
+capped at ``PAGINATION_MAX_LIMIT`` nodes.
+"""
+from flask import current_app, has_app_context
+from graphene import relay
+from graphql import GraphQLError
+
+from projection import only_requested
+from utils.pagination import PaginationError, decode_cursor, encode_cursor
+
+
+def _page_size(first):
+    default_limit, max_limit = 50, 500
+    if has_app_context():
+        default_limit = current_app.config.get('PAGINATION_DEFAULT_LIMIT', default_limit)
+        max_limit = current_app.config.get('PAGINATION_MAX_LIMIT', max_limit)
+    if first is None:
+        return default_limit
+    if first < 1:
+        raise GraphQLError("first must be positive")
+    return min(first, max_limit)
+
+
+def keyset_connection(connection_type, queryset, info, first=None, after=None, last=None, before=None, **kwargs):
+    """Resolve one forward page of ``queryset`` as ``connection_type``."""
+    if last is not None or before is not None:
+        raise GraphQLError("Only forward pagination with first/after is supported")
+
+    limit = _page_size(first)
+    if after:
+        try:
+            queryset = queryset.filter(id__gt=decode_cursor(after))
+        except PaginationError as e:
+            raise GraphQLError(str(e))
+
+    queryset = only_requested(queryset, info, path=('edges', 'node'))
+    documents = list(queryset.order_by('id').limit(limit + 1))
+    has_next_page = len(documents) > limit
+    documents = documents[:limit]
+
+    edges = [
+        connection_type.Edge(node=document, cursor=encode_cursor(document.id))
+        for document in documents
+    ]
+    page_info = relay.PageInfo(
+        start_cursor=edges[0].cursor if edges else None,
+        end_cursor=edges[-1].cursor if edges else None,
+        has_next_page=has_next_page,
+        has_previous_page=bool(after)
+    )
+    return connection_type(edges=edges, page_info=page_info)
@@ -0,0 +1,196 @@
+# cost.py
+"""Static cost and depth analysis for GraphQL operations.
+
+Runs against the parsed document before execution so that an expensive
+query is rejected without touching Mongo. Every object field costs
+``DEFAULT_OBJECT_COST`` (scalars are free) unless ``FIELD_COSTS`` says
+otherwise, and a field taking a ``first``/``last`` argument multiplies the
+cost of its selection by the page size it asks for, or by the default page
+size when the query leaves it out.
+"""
+import threading
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationType,
+    get_named_type,
+    get_operation_ast,
+    is_leaf_type,
+)
+from graphql.utilities import value_from_ast_untyped
+
+from utils.metrics import register_metrics
+
+DEFAULT_OBJECT_COST = 1
+
+# Arguments that bound how many rows a list or connection field returns
+PAGE_SIZE_ARGUMENTS = {'first', 'last'}
+
+# Per-field overrides keyed by "<ParentType>.<field>"
+FIELD_COSTS = {
+    'Query.user': 1,
+    'Query.donor': 1,
+    'Query.volunteer': 1,
+    'Query.student': 1,
+    'Query.users': 2,
+    'Query.donors': 2,
+    'Query.volunteers': 2,
+    'Query.students': 2,
+    # Hashes a password with bcrypt
+    'Mutation.createUser': 50,
+}
+
+
+class QueryCost:
+    def __init__(self, cost, depth):
+        self.cost = cost
+        self.depth = depth
+
+
+class CostAnalyzer:
+
+    def __init__(self, schema, max_cost=5000, max_depth=10, default_page_size=50, max_page_size=500):
+        self.schema = schema
+        self._lock = threading.Lock()
+        self.configure(max_cost, max_depth, default_page_size, max_page_size)
+
+    def configure(self, max_cost, max_depth, default_page_size, max_page_size):
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self._analyzed = 0
+        self._rejected = 0
+        self._cost_total = 0
+        self._cost_max = 0
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('GRAPHQL_MAX_COST', 5000),
+            app.config.get('GRAPHQL_MAX_DEPTH', 10),
+            app.config.get('PAGINATION_DEFAULT_LIMIT', 50),
+            app.config.get('PAGINATION_MAX_LIMIT', 500)
+        )
+
+    def analyze(self, document, variables=None, operation_name=None):
+        """Return the ``QueryCost`` of the operation that would be executed."""
+        operation = get_operation_ast(document, operation_name)
+        if operation is None:
+            return QueryCost(0, 0)
+
+        root_type = {
+            OperationType.QUERY: self.schema.query_type,
+            OperationType.MUTATION: self.schema.mutation_type,
+            OperationType.SUBSCRIPTION: self.schema.subscription_type,
+        }[operation.operation]
+        fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        cost, depth = self._selection_cost(operation.selection_set, root_type, fragments, variables or {}, set())
+        return QueryCost(cost, depth)
+
+    def check(self, document, variables=None, operation_name=None):
+        """Analyze and record the operation; raise ``GraphQLError`` if over budget."""
+        result = self.analyze(document, variables, operation_name)
+        over_budget = result.cost > self.max_cost or result.depth > self.max_depth
+        with self._lock:
+            self._analyzed += 1
+            self._cost_total += result.cost
+            self._cost_max = max(self._cost_max, result.cost)
+            if over_budget:
+                self._rejected += 1
+
+        if over_budget:
+            if result.depth > self.max_depth:
+                message = f"Query depth {result.depth} exceeds the maximum of {self.max_depth}"
+            else:
+                message = f"Query cost {result.cost} exceeds the maximum of {self.max_cost}"
+            raise GraphQLError(message, extensions={
+                "code": "QUERY_TOO_COMPLEX",
+                "cost": result.cost,
+                "maxCost": self.max_cost,
+                "depth": result.depth,
+                "maxDepth": self.max_depth
+            })
+        return result
+
+    def stats(self):
+        analyzed = self._analyzed
+        return {
+            "analyzed": analyzed,
+            "rejected": self._rejected,
+            "avg_cost": round(self._cost_total / analyzed, 2) if analyzed else 0.0,
+            "max_cost_seen": self._cost_max,
+            "max_cost": self.max_cost,
+            "max_depth": self.max_depth
+        }
+
+    def _page_size(self, field, field_node, variables):
+        """Rows a paginated field can return, or None for fields that take no page size.
+
+        A missing or invalid ``first``/``last`` still fetches a default-sized
+        page, so it is costed as one; otherwise aliasing many unsized
+        connections would slip under the budget.
+        """
+        if not PAGE_SIZE_ARGUMENTS & set(field.args):
+            return None
+        sizes = []
+        for argument in field_node.arguments:
+            if argument.name.value in PAGE_SIZE_ARGUMENTS:
+                value = value_from_ast_untyped(argument.value, variables)
+                if isinstance(value, int) and value > 0:
+                    sizes.append(min(value, self.max_page_size))
+        return min(sizes) if sizes else self.default_page_size
+
+    def _selection_cost(self, selection_set, parent_type, fragments, variables, visited):
+        cost = 0
+        depth = 0
+        for selection in selection_set.selections if selection_set else ():
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                if name.startswith('__'):
+                    # Introspection and __typename are free and unbounded by depth
+                    continue
+                field = parent_type.fields.get(name)
+                if field is None:
+                    continue
+                field_type = get_named_type(field.type)
+                child_cost, child_depth = 0, 0
+                if not is_leaf_type(field_type):
+                    child_cost, child_depth = self._selection_cost(
+                        selection.selection_set, field_type, fragments, variables, visited
+                    )
+                own_cost = FIELD_COSTS.get(
+                    f"{parent_type.name}.{name}",
+                    0 if is_leaf_type(field_type) else DEFAULT_OBJECT_COST
+                )
+                multiplier = self._page_size(field, selection, variables) or 1
+                cost += own_cost + multiplier * child_cost
+                depth = max(depth, child_depth + 1)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value) or parent_type
+                fragment_cost, fragment_depth = self._selection_cost(
+                    selection.selection_set, fragment_type, fragments, variables, visited
+                )
+                cost += fragment_cost
+                depth = max(depth, fragment_depth)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = fragments.get(name)
+                if fragment is None or name in visited:
+                    continue
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value) or parent_type
+                fragment_cost, fragment_depth = self._selection_cost(
+                    fragment.selection_set, fragment_type, fragments, variables, visited | {name}
+                )
+                cost += fragment_cost
+                depth = max(depth, fragment_depth)
+        return cost, depth
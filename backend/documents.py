@@ -0,0 +1,91 @@
+# documents.py
+"""Parsed-document cache and persisted queries for /api/graphql.
+
+Frontends send the same handful of query strings over and over. Parsing
+and validating them once per worker and keeping the resulting
+``DocumentNode`` in an LRU keyed by the query's SHA-256 removes that work
+from the hot path. Clients may also send only the hash (Apollo-style
+``extensions.persistedQuery``) once the query is known to the server.
+"""
+import hashlib
+import json
+
+from graphql import GraphQLError, GraphQLSyntaxError, parse, validate
+
+from utils.lru import LRUCache
+
+PERSISTED_QUERY_NOT_FOUND = 'PERSISTED_QUERY_NOT_FOUND'
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+class DocumentCache:
+
+    def __init__(self, schema, maxsize=512, persisted_maxsize=1024):
+        self.schema = schema
+        self.documents = LRUCache(maxsize)
+        self.persisted = LRUCache(persisted_maxsize)
+        # Queries loaded from a manifest are never evicted
+        self.manifest = {}
+
+    def configure(self, config):
+        self.documents.resize(config.get('GRAPHQL_DOCUMENT_CACHE_SIZE', 512))
+        self.persisted.resize(config.get('GRAPHQL_PERSISTED_QUERY_CACHE_SIZE', 1024))
+        manifest_path = config.get('GRAPHQL_PERSISTED_QUERIES_FILE')
+        if manifest_path:
+            with open(manifest_path) as manifest:
+                self.manifest = json.load(manifest)
+
+    def resolve_query(self, query, extensions):
+        """Return the query text for a request, registering persisted hashes.
+
+        Raises ``GraphQLError`` when only an unknown hash was sent, or when
+        the hash does not match the query it was sent with.
+        """
+        if query is not None and not isinstance(query, str):
+            raise GraphQLError("Must provide query string.")
+        persisted = (extensions or {}).get('persistedQuery') or {}
+        sha = persisted.get('sha256Hash')
+        if not sha:
+            if not query:
+                raise GraphQLError("Must provide query string.")
+            return query
+
+        if query:
+            if query_hash(query) != sha:
+                raise GraphQLError("provided sha does not match query")
+            if sha not in self.manifest:
+                self.persisted.set(sha, query)
+            return query
+
+        stored = self.manifest.get(sha) or self.persisted.get(sha)
+        if stored is None:
+            raise GraphQLError("PersistedQueryNotFound", extensions={"code": PERSISTED_QUERY_NOT_FOUND})
+        return stored
+
+    def get_document(self, query):
+        """Return ``(document, errors)`` for ``query``, parsing at most once."""
+        key = query_hash(query)
+        cached = self.documents.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            document = parse(query)
+        except GraphQLSyntaxError as error:
+            # Syntax errors are not cached; they are cheap to reproduce
+            return None, [error]
+
+        errors = validate(self.schema, document)
+        entry = (document, errors) if not errors else (None, errors)
+        self.documents.set(key, entry)
+        return entry
+
+    def stats(self):
+        return {
+            "documents": self.documents.stats(),
+            "persisted": self.persisted.stats(),
+            "manifest_size": len(self.manifest)
+        }
@@ -0,0 +1,48 @@
+# gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Every worker also starts PASSWORD_HASHER_WORKERS bcrypt processes (default 1),
+# so a host runs up to workers * PASSWORD_HASHER_WORKERS of them: 2 * cores + 1
+# with the defaults, each allowed PASSWORD_HASHER_MAX_PENDING queued logins.
+# Lower GUNICORN_WORKERS before raising the hasher pool on small hosts.
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+# Load the app once in the master so workers fork with it already imported
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() in ['1', 'true', 'yes']
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def pre_fork(server, worker):
+    # Anything opened while preloading (e.g. startup index creation) is
+    # closed in the master so no worker inherits a live MongoClient
+    from config.database import mongo
+    mongo.close()
+
+
+def post_fork(server, worker):
+    # Each worker opens its own client and pool right after forking
+    from config.database import mongo
+    mongo.client
+    server.log.info("Worker %s created its MongoDB client", worker.pid)
+
+
+def worker_exit(server, worker):
+    from config.database import mongo
+    from services.passwords import password_hasher
+    from async_execution import resolver_pool
+    password_hasher.shutdown()
+    resolver_pool.shutdown()
+    mongo.close()
+    server.log.info("Worker %s closed its MongoDB client", worker.pid)
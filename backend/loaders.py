@@ -0,0 +1,106 @@
+# loaders.py
+"""Per-request batching loaders for the GraphQL resolvers in schema.py.
+
+A document such as ``{ a: donor(id: "1") { name } b: donor(id: "2") { name } }``
+used to issue one ``Donor.objects.get`` per field. ``load_by_id`` instead
+collects every id requested for the same field across the operation and
+fetches them with a single ``$in`` query, caching documents for the rest of
+the request.
+"""
+import threading
+
+from bson.objectid import ObjectId
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.utilities import value_from_ast_untyped
+
+
+class ModelLoader:
+    """Batches and caches ``Model.objects(id__in=...)`` lookups by id."""
+
+    def __init__(self, model):
+        self.model = model
+        self._cache = {}
+        self._pending = set()
+        # Root fields may resolve concurrently (see async_execution.py)
+        self._lock = threading.Lock()
+
+    def prime(self, ids):
+        """Queue ids to be fetched with the next batch."""
+        with self._lock:
+            self._pending.update(str(id) for id in ids if id is not None and str(id) not in self._cache)
+
+    def load(self, id):
+        key = str(id)
+        with self._lock:
+            if key not in self._cache:
+                self._pending.add(key)
+                self._dispatch()
+            document = self._cache[key]
+        if document is None:
+            raise self.model.DoesNotExist(f"{self.model.__name__} matching query does not exist.")
+        return document
+
+    def _dispatch(self):
+        ids, self._pending = self._pending, set()
+        # A malformed id only fails its own field, not the whole batch
+        valid_ids = [key for key in ids if ObjectId.is_valid(key)]
+        for document in self.model.objects(id__in=valid_ids):
+            self._cache[str(document.id)] = document
+        for key in ids:
+            self._cache.setdefault(key, None)
+
+
+class Loaders:
+    """One ModelLoader per model, created lazily for a single request."""
+
+    def __init__(self):
+        self._loaders = {}
+        self._lock = threading.Lock()
+
+    def for_model(self, model):
+        with self._lock:
+            if model not in self._loaders:
+                self._loaders[model] = ModelLoader(model)
+            return self._loaders[model]
+
+
+def get_loaders(info):
+    context = info.context
+    if context is None:
+        # Executed without a request context (e.g. schema.execute in a shell)
+        return Loaders()
+    return context.setdefault('loaders', Loaders())
+
+
+def _iter_fields(selection_set, fragments, visited=None):
+    visited = set() if visited is None else visited
+    for selection in selection_set.selections if selection_set else ():
+        if isinstance(selection, FieldNode):
+            yield selection
+            yield from _iter_fields(selection.selection_set, fragments, visited)
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _iter_fields(selection.selection_set, fragments, visited)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name not in visited and name in fragments:
+                visited.add(name)
+                yield from _iter_fields(fragments[name].selection_set, fragments, visited)
+
+
+def requested_ids(info, arg_name='id'):
+    """Every ``arg_name`` value passed to fields named like the current one."""
+    ids = []
+    for field in _iter_fields(info.operation.selection_set, info.fragments):
+        if field.name.value != info.field_name:
+            continue
+        for argument in field.arguments:
+            if argument.name.value == arg_name:
+                ids.append(value_from_ast_untyped(argument.value, info.variable_values))
+    return ids
+
+
+def load_by_id(info, model, id):
+    """Resolve ``model`` by id, batching with sibling fields of the same name."""
+    loader = get_loaders(info).for_model(model)
+    loader.prime(requested_ids(info))
+    return loader.load(id)
@@ -1,14 +1,17 @@
 # models/__init__.py
-from mongoengine import connect
-import os
+from config.database import mongo
 
 def initialize_db(app):
     # Get configuration from app config
     db_name = app.config.get('MONGODB_DB', 'food2')
-    host = app.config.get('MONGODB_URI', 'mongodb://localhost:27017/food2')
-    
-    connect(db=db_name, host=host)
-    print(f"Connected to MongoDB: {db_name} at {host}")
+
+    # Configure the shared client, then point mongoengine at it so the ORM
+    # and the raw-PyMongo routes use a single connection pool. Nothing
+    # connects until the first query, so a pre-forking server can load the
+    # app before forking workers.
+    mongo.init_app(app)
+    mongo.register_mongoengine()
+    app.logger.info("MongoDB configured for database %s; connecting on first use", db_name)
 
 # Import all models
 from .user import User
@@ -16,4 +19,4 @@ from .donor import Donor
 from .volunteer import Volunteer
 from .student import Student
 
-__all__ = ['User', 'Donor', 'Volunteer', 'Student', 'initialize_db']
\ No newline at end of file
+__all__ = ['User', 'Donor', 'Volunteer', 'Student', 'initialize_db']
@@ -9,8 +9,20 @@ class Donor(Document):
     address = StringField()
     district = StringField()
     weight = StringField()
+    last_donation_at = DateTimeField()
+    next_eligible_at = DateTimeField()  # Denormalized from donations, see services.eligibility
     timeanddate = DateTimeField()  # Automatically updated on save
 
+    meta = {
+        'indexes': [
+            ('blood_type', 'district', '-timeanddate', 'next_eligible_at'),
+            ('blood_type', '-timeanddate', 'next_eligible_at'),
+            'district',
+            'next_eligible_at',
+            '-timeanddate'
+        ]
+    }
+
     @classmethod
     def pre_save(cls, sender, document, **kwargs):
         """Update the timeanddate field before saving with Indian timezone."""
@@ -26,6 +38,8 @@ class Donor(Document):
             "address": self.address,
             "district": self.district,
             "weight": self.weight,
+            "last_donation_at": self.last_donation_at.isoformat() if self.last_donation_at else None,
+            "next_eligible_at": self.next_eligible_at.isoformat() if self.next_eligible_at else None,
             "timeanddate": self.timeanddate.isoformat() if self.timeanddate else None
         }
 
@@ -8,6 +8,12 @@ class Student(Document):
     branch = StringField()
     timeanddate = DateTimeField()  # Automatically updated on save
 
+    meta = {
+        'indexes': [
+            '-timeanddate'
+        ]
+    }
+
     @classmethod
     def pre_save(cls, sender, document, **kwargs):
         """Update the timeanddate field before saving with Indian timezone."""
@@ -1,4 +1,4 @@
-from flask_bcrypt import generate_password_hash, check_password_hash
+from services.passwords import password_hasher
 from mongoengine import Document, StringField, DateTimeField
 from datetime import datetime
 import pytz
@@ -10,12 +10,28 @@ class User(Document):
     contact = StringField()
     address = StringField()
     timeanddate = DateTimeField()
+
+    meta = {
+        # email's unique index comes from unique=True on the field
+        'indexes': [
+            '-timeanddate'
+        ]
+    }
     
     def hash_password(self):
-        self.password = generate_password_hash(self.password).decode('utf8')
+        # bcrypt runs in the shared worker pool, see services/passwords.py
+        self.password = password_hasher.hash(self.password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        valid = password_hasher.verify(self.password, password)
+        if valid:
+            # Migrate hashes made with a different BCRYPT_LOG_ROUNDS in the background
+            password_hasher.rehash_later(self.password, password, self._store_rehash)
+        return valid
+
+    def _store_rehash(self, old_hash, new_hash):
+        # Only replace the hash that was verified, never a concurrent password change
+        User.objects(id=self.id, password=old_hash).update_one(set__password=new_hash)
     
     def save(self, *args, **kwargs):
         """Override save to automatically set timeanddate if not set"""
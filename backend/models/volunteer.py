@@ -9,6 +9,13 @@ class Volunteer(Document):
     district = StringField()
     timeanddate = DateTimeField()  # Automatically updated on save
 
+    meta = {
+        'indexes': [
+            'district',
+            '-timeanddate'
+        ]
+    }
+
     @classmethod
     def pre_save(cls, sender, document, **kwargs):
         """Update the timeanddate field before saving with Indian timezone."""
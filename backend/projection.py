@@ -0,0 +1,63 @@
+# projection.py
+"""Restrict mongoengine querysets to the fields a GraphQL query selects.
+
+``{ donors { name bloodType } }`` only needs two fields per document, so the
+list resolvers apply ``.only('name', 'blood_type')`` instead of loading
+every field of every donor.
+"""
+from graphene.utils.str_converters import to_snake_case
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+
+def _selected_names(selection_set, fragments, visited):
+    for selection in selection_set.selections if selection_set else ():
+        if isinstance(selection, FieldNode):
+            yield selection.name.value
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _selected_names(selection.selection_set, fragments, visited)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name not in visited and name in fragments:
+                visited.add(name)
+                yield from _selected_names(fragments[name].selection_set, fragments, visited)
+
+
+def _descend(selection_sets, name, fragments):
+    """Selection sets of the child fields called ``name``."""
+    children = []
+    for selection_set in selection_sets:
+        for selection in selection_set.selections if selection_set else ():
+            if isinstance(selection, FieldNode) and selection.name.value == name:
+                children.append(selection.selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                children.extend(_descend([selection.selection_set], name, fragments))
+            elif isinstance(selection, FragmentSpreadNode) and selection.name.value in fragments:
+                children.extend(_descend([fragments[selection.name.value].selection_set], name, fragments))
+    return children
+
+
+def requested_fields(info, model, path=()):
+    """Model field names selected on the current field, across all its nodes.
+
+    ``path`` walks down to nested selections first, e.g. ``('edges', 'node')``
+    for a Relay connection.
+    """
+    selection_sets = [field_node.selection_set for field_node in info.field_nodes]
+    for name in path:
+        selection_sets = _descend(selection_sets, name, info.fragments)
+
+    fields = set()
+    visited = set()
+    for selection_set in selection_sets:
+        for name in _selected_names(selection_set, info.fragments, visited):
+            field_name = to_snake_case(name)
+            if field_name in model._fields:
+                fields.add(field_name)
+    return fields
+
+
+def only_requested(queryset, info, path=()):
+    """Apply ``.only()`` for the selected fields; ``id`` is always kept."""
+    fields = requested_fields(info, queryset._document, path)
+    fields.add('id')
+    return queryset.only(*fields)
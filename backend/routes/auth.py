@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, get_jwt_identity
 from flask_bcrypt import check_password_hash
+from mongoengine.errors import NotUniqueError
 from models.user import User
 from middleware.auth import authenticate_token
+from services.passwords import PasswordHasherBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -15,9 +17,6 @@ def register():
     if not email or not password:
         return jsonify({"message": "Email and password are required"}), 400
     
-    if User.objects(email=email).first():
-        return jsonify({"message": "User already exists"}), 409
-    
     try:
         # Let the User model handle the datetime automatically
         new_user = User(
@@ -38,6 +37,11 @@ def register():
                 "timeanddate": new_user.timeanddate.isoformat() if new_user.timeanddate else None
             }
         }), 201
+    except NotUniqueError:
+        # The unique email index rejects duplicates, no lookup needed beforehand
+        return jsonify({"message": "User already exists"}), 409
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         return jsonify({"message": "Error registering user", "error": str(e)}), 500
       
@@ -1,37 +1,47 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from config.database import mongo
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
 from flask_jwt_extended import jwt_required
 from datetime import datetime
 from pytz import timezone
+from utils.pagination import paginate, PaginationError
+from utils.streaming import wants_stream, ndjson_response
+from utils.serialization import serialize_document
+from utils.conditional import conditional, bump_version
+from utils.response_cache import cached
+from utils.bulk import bulk_request, BulkBodyError
+from services.bulk import bulk_insert, bulk_update, bulk_delete, unclaimed, without_claims
+from services.blood_types import COMPATIBLE_DONORS, normalize_blood_type
+from services.matching import find_matching_donors
+from services.inventory import donor_inventory
+from services.eligibility import EligibilityError, eligible_now, record_donation
 
 # Blueprint for donor routes schema for /api/donors
 donor_bp = Blueprint('donors', __name__)
 
-# Utility function to serialize MongoDB documents
-def serialize_document(doc):
-    """Converts MongoDB ObjectId fields and datetime fields to strings for JSON serialization."""
-    if not doc:
-        return doc
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])  # Add 'id' field with stringified ObjectId
-        doc["_id"] = str(doc["_id"])  # Keep '_id' field as string
-    if "timeanddate" in doc and isinstance(doc["timeanddate"], datetime):
-        doc["timeanddate"] = doc["timeanddate"].isoformat()  # Convert datetime to ISO 8601 string
-    return doc
+# ?eligible=1 cut-off, truncated to the minute so the response can be cached
+def eligible_as_of():
+    if request.args.get('eligible', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    return datetime.now(timezone('UTC')).replace(second=0, microsecond=0)
+
+# Eligibility changes as time passes, not only on writes
+def eligibility_vary():
+    as_of = eligible_as_of()
+    return as_of.isoformat() if as_of else ''
 
 # Create a donor
 @donor_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_donor():
     try:
-        data = request.get_json()
-        result = mongo.db.donors.insert_one(data)
-        donor_id = str(result.inserted_id)
-
-        # Fetch the inserted donor document
-        donor = mongo.db.donors.find_one({"_id": ObjectId(donor_id)})
-        donor = serialize_document(donor)
+        data = donor_inventory.prepare(request.get_json())
+        # insert_one adds the generated _id to data, which is the stored document
+        mongo.db.donors.insert_one(data)
+        donor_inventory.apply(mongo.db, [(None, data)])
+        bump_version('donors')
+        donor = serialize_document(data)
 
         return jsonify({
             "message": "Donor created successfully",
@@ -39,28 +49,168 @@ def create_donor():
         }), 201
     except Exception as e:
         return jsonify({"message": "Error creating donor", "error": str(e)}), 500
-    
+
+
+# Bulk create, update or delete donors from a JSON array or an NDJSON body
+@donor_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_donors():
+    try:
+        return bulk_request(bulk_insert, 'donors', tracker=donor_inventory)
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error creating donors", "error": str(e)}), 500
+
+@donor_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_donors():
+    try:
+        return bulk_request(bulk_update, 'donors', tracker=donor_inventory)
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error updating donors", "error": str(e)}), 500
+
+@donor_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_delete_donors():
+    try:
+        return bulk_request(bulk_delete, 'donors', tracker=donor_inventory)
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error deleting donors", "error": str(e)}), 500
+
 # Get all donors
 @donor_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('donors', vary=eligibility_vary)
+@cached('donors')
 def get_all_donors():
     try:
-        donors = list(mongo.db.donors.find())
-        # Serialize each donor document
-        donors = [serialize_document(donor) for donor in donors]
-        return jsonify(donors), 200
+        # ?eligible=1 keeps donors past their deferral (indexed range on next_eligible_at)
+        as_of = eligible_as_of()
+        query = eligible_now(as_of) if as_of else None
+
+        if wants_stream():
+            return ndjson_response(mongo.db.donors, query, serializer=serialize_document)
+
+        # One keyset page of serialized donors plus the next cursor
+        page = paginate(mongo.db.donors, query, serializer=serialize_document)
+        return jsonify(page), 200
         # json , 200(ok)
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Error fetching donors", "error": str(e)}), 500
         # 500 internal server error
 
+# Find donors compatible with a recipient blood type
+@donor_bp.route('/match', methods=['GET'])
+@jwt_required()
+@conditional('donors', vary=eligibility_vary)
+@cached('donors')
+def match_donors():
+    try:
+        recipient = normalize_blood_type(request.args.get('recipient'))
+        if not recipient:
+            return jsonify({"message": "A valid recipient blood type is required"}), 400
+
+        district = request.args.get('district')
+        try:
+            limit = int(request.args.get('limit', 20))
+        except ValueError:
+            return jsonify({"message": "limit must be an integer"}), 400
+        limit = max(1, min(limit, current_app.config.get('PAGINATION_MAX_LIMIT', 500)))
+
+        donors = find_matching_donors(
+            mongo.db.donors, recipient, district=district, limit=limit, eligible_at=eligible_as_of()
+        )
+        donors = [serialize_document(donor) for donor in donors]
+
+        return jsonify({
+            "recipient": recipient,
+            "district": district,
+            "compatible_types": list(COMPATIBLE_DONORS[recipient]),
+            "donors": donors
+        }), 200
+    except Exception as e:
+        return jsonify({"message": "Error matching donors", "error": str(e)}), 500
+
+# Donor counts per district and blood type, from the maintained inventory
+@donor_bp.route('/stats', methods=['GET'])
+@jwt_required()
+@conditional('donors')
+@cached('donors')
+def donor_stats():
+    try:
+        stats = donor_inventory.stats(mongo.db, district=request.args.get('district'))
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({"message": "Error fetching donor stats", "error": str(e)}), 500
+
+# Record a donation; pushes the donor's next eligible date forward
+@donor_bp.route('/<donor_id>/donations', methods=['POST'])
+@jwt_required()
+def create_donation(donor_id):
+    try:
+        try:
+            donor_id = ObjectId(donor_id)
+        except InvalidId:
+            return jsonify({"message": "Invalid donor ID"}), 400
+
+        data = request.get_json() or {}
+        recorded = record_donation(
+            mongo.db,
+            donor_id,
+            data.get('type', 'whole_blood'),
+            data.get('donated_at'),
+            current_app.config.get('DONATION_DEFERRAL_DAYS')
+        )
+        if recorded is None:
+            return jsonify({"message": "Donor not found"}), 404
+        bump_version('donors')
+
+        donor, donation = recorded
+        return jsonify({
+            "message": "Donation recorded successfully",
+            "donor": serialize_document(donor),
+            "donation": serialize_document(donation)
+        }), 201
+    except EligibilityError as e:
+        return jsonify({"message": "Invalid donation", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error recording donation", "error": str(e)}), 500
+
+# Donation history of a donor, oldest first
+@donor_bp.route('/<donor_id>/donations', methods=['GET'])
+@jwt_required()
+@conditional('donors')
+@cached('donors')
+def get_donations(donor_id):
+    try:
+        try:
+            donor_id = ObjectId(donor_id)
+        except InvalidId:
+            return jsonify({"message": "Invalid donor ID"}), 400
+
+        page = paginate(mongo.db.donations, {"donor_id": donor_id}, serializer=serialize_document)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error fetching donations", "error": str(e)}), 500
+
 # Get a donor by user ID
 @donor_bp.route('/user/<user_id>', methods=['GET'])
 @jwt_required()
+@conditional('donors')
+@cached('donors')
 def get_donor_by_user_id(user_id):
     try:
         # M : path = LOCAL/ user / < user_id >
-        donor = mongo.db.donors.find_one({"userId": ObjectId(user_id)}) 
+        donor = mongo.db.donors.find_one({"userId": ObjectId(user_id)}, without_claims())
         if not donor:
             return jsonify({"message": "Donor not found"}), 404
 
@@ -78,15 +228,17 @@ def get_donor_by_user_id(user_id):
 @jwt_required()
 def delete_donor(donor_id):
     try:
-        # Convert donor_id to ObjectId
-
-        donor = mongo.db.donors.find_one({"_id": ObjectId(donor_id)})
+        # Delete the donor, None if it did not exist
+        donor = mongo.db.donors.find_one_and_delete(
+            {"_id": ObjectId(donor_id), **unclaimed()},
+            projection={field: 1 for field in donor_inventory.fields}
+        )
         if not donor:
             return jsonify({"message": "Donor not found"}), 404
             # 404 not found
 
-        # Delete the donor
-        mongo.db.donors.delete_one({"_id": ObjectId(donor_id)})
+        donor_inventory.apply(mongo.db, [(donor, None)])
+        bump_version('donors')
         return jsonify({"message": "Donor deleted successfully"}), 200
         # 200 ok
     except Exception as e:
@@ -0,0 +1,37 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from config.database import mongo
+from services.export import (
+    COLUMNS, FORMATS, ExportError, arrow_schema, build_query, detect_format,
+    iter_export_chunks, iter_record_batches, select_columns
+)
+
+exports_bp = Blueprint('exports', __name__)
+
+# Download a collection as Parquet or Feather for analytics tools.
+# ?format=parquet|feather&columns=name,district&district=..&blood_type=..&since=..&until=..
+@exports_bp.route('/<kind>', methods=['GET'])
+@jwt_required()
+def export_collection(kind):
+    if kind not in COLUMNS:
+        return jsonify({"message": f"Unknown export type {kind!r}", "types": sorted(COLUMNS)}), 404
+    try:
+        fmt = detect_format(declared=request.args.get('format'))
+        raw_columns = request.args.get('columns')
+        columns = select_columns(kind, raw_columns.split(',') if raw_columns else None)
+        query = build_query(
+            kind,
+            district=request.args.get('district'),
+            blood_type=request.args.get('blood_type'),
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        )
+        schema = arrow_schema(columns)
+    except ExportError as e:
+        return jsonify({"message": "Invalid export request", "error": str(e)}), 400
+
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 10000)
+    batches = iter_record_batches(mongo.db[kind], columns, query, batch_size)
+    response = Response(stream_with_context(iter_export_chunks(batches, schema, fmt)), mimetype=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
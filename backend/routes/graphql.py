@@ -1,20 +1,72 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-from graphql import graphql_sync
+from graphql import GraphQLError, execute_sync
 from schema import schema
+from documents import DocumentCache
+from cost import CostAnalyzer
+from async_execution import execute_concurrently, resolver_pool, runs_concurrently
+from services.passwords import PasswordHasherBusy
+from utils.metrics import register_metrics
 
 graphql_bp = Blueprint('graphql', __name__)
 
+# Parsed/validated documents and persisted queries, shared by this worker
+documents = DocumentCache(schema.graphql_schema)
+register_metrics('graphql_documents', documents.stats)
+
+# Static cost/depth limits checked before execution
+cost_analyzer = CostAnalyzer(schema.graphql_schema)
+register_metrics('graphql_cost', cost_analyzer.stats)
+
+@graphql_bp.record_once
+def configure_documents(state):
+    documents.configure(state.app.config)
+    cost_analyzer.init_app(state.app)
+    resolver_pool.configure(state.app.config.get('GRAPHQL_ASYNC_WORKERS', 8))
+
+def error_response(errors, status=400):
+    return jsonify({"errors": [error.formatted for error in errors]}), status
+
 @graphql_bp.route('/graphql', methods=['POST'])
 @jwt_required()
 def graphql_server():
     data = request.get_json()
-    query = data.get('query')
     variables = data.get('variables')
+
+    try:
+        query = documents.resolve_query(data.get('query'), data.get('extensions'))
+    except GraphQLError as error:
+        return error_response([error])
+
+    document, errors = documents.get_document(query)
+    if errors:
+        return error_response(errors)
+
+    try:
+        query_cost = cost_analyzer.check(document, variables, data.get('operationName'))
+    except GraphQLError as error:
+        return error_response([error])
     
-    result = graphql_sync(schema, query, variable_values=variables)
+    # Fresh context per request so batching loaders never share a cache
+    context = {"request": request}
+    execute_kwargs = {
+        "variable_values": variables,
+        "context_value": context,
+        "operation_name": data.get('operationName')
+    }
+    if current_app.config.get('GRAPHQL_ASYNC_EXECUTION', True) and runs_concurrently(document, data.get('operationName')):
+        # Independent root fields resolve concurrently on a thread pool
+        result = execute_concurrently(schema.graphql_schema, document, **execute_kwargs)
+    else:
+        result = execute_sync(schema.graphql_schema, document, **execute_kwargs)
+
+    # Surface password-pool backpressure from mutations as a 429
+    if result.errors and any(isinstance(error.original_error, PasswordHasherBusy) for error in result.errors):
+        raise PasswordHasherBusy("Password hashing queue is full")
     
-    return jsonify(result.data), 200 if not result.errors else 400
+    response = jsonify(result.data)
+    response.headers['X-GraphQL-Cost'] = str(query_cost.cost)
+    return response, 200 if not result.errors else 400
 
 @graphql_bp.route('/graphiql')
 def graphiql():
@@ -0,0 +1,39 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from config.database import mongo
+from services.importer import SCHEMAS, ImportFormatError, detect_format, iter_rows, run_import
+from utils.conditional import bump_version
+from utils.streaming import NDJSON_MIMETYPE
+
+imports_bp = Blueprint('imports', __name__)
+
+# Import donors or volunteers from an uploaded CSV/XLSX file ("file" form field).
+# Rejected rows, per-batch progress and the final totals are streamed back as NDJSON.
+@imports_bp.route('/<kind>', methods=['POST'])
+@jwt_required()
+def import_spreadsheet(kind):
+    if kind not in SCHEMAS:
+        return jsonify({"message": f"Unknown import type {kind!r}", "types": sorted(SCHEMAS)}), 404
+
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({"message": "A CSV or XLSX file is required in the 'file' field"}), 400
+    try:
+        fmt = detect_format(upload.filename, request.form.get('format'))
+    except ImportFormatError as e:
+        return jsonify({"message": "Invalid import file", "error": str(e)}), 400
+
+    batch_size = current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+
+    def generate():
+        dumps = current_app.json.dumps
+        try:
+            for event in run_import(mongo.db[kind], iter_rows(upload.stream, fmt), kind, batch_size):
+                yield dumps(event) + '\n'
+        except Exception as e:
+            yield dumps({"event": "error", "message": "Error importing file", "error": str(e)}) + '\n'
+        finally:
+            # Once for the whole upload; batches already written stay even if it fails
+            bump_version(kind)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -1,33 +1,31 @@
 from flask import Blueprint, request, jsonify
 from config.database import mongo
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument
 from flask_jwt_extended import jwt_required
+from utils.pagination import paginate, PaginationError
+from utils.streaming import wants_stream, ndjson_response
+from utils.serialization import serialize_document
+from utils.conditional import conditional, bump_version
+from utils.response_cache import cached
+from utils.bulk import bulk_request, BulkBodyError
+from services.bulk import bulk_insert, bulk_update, bulk_delete, unclaimed, without_claims
 
 student_bp = Blueprint('students', __name__)
 
-def serialize_document(doc):
-    """
-    Converts MongoDB document ObjectId fields to strings for JSON serialization.
-    Adds an 'id' field that mirrors the '_id' field.
-    """
-    if not doc:
-        return doc
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])  # Add 'id' field
-        doc["_id"] = str(doc["_id"])  # Convert '_id' to string
-    for key, value in doc.items():
-        if isinstance(value, ObjectId):
-            doc[key] = str(value)
-    return doc
-
 @student_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('students')
+@cached('students')
 def get_students():
     try:
-        students = list(mongo.db.students.find())
-        # Serialize each student document
-        students = [serialize_document(student) for student in students]
-        return jsonify(students), 200
+        if wants_stream():
+            return ndjson_response(mongo.db.students, serializer=serialize_document)
+
+        page = paginate(mongo.db.students, serializer=serialize_document)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Error retrieving students", "error": str(e)}), 500
     
@@ -36,11 +34,9 @@ def get_students():
 def create_student():
     try:
         data = request.get_json()
-        result = mongo.db.students.insert_one(data)
-        student_id = str(result.inserted_id)
-
-        student = mongo.db.students.find_one({"_id": ObjectId(student_id)})
-        student = serialize_document(student)
+        mongo.db.students.insert_one(data)
+        bump_version('students')
+        student = serialize_document(data)
 
         return jsonify({
             "message": "Student created successfully",
@@ -48,13 +44,46 @@ def create_student():
         }), 201
     except Exception as e:
         return jsonify({"message": "Error creating student", "error": str(e)}), 500
-    
-    
+
+
+# Bulk create, update or delete students from a JSON array or an NDJSON body
+@student_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_students():
+    try:
+        return bulk_request(bulk_insert, 'students')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error creating students", "error": str(e)}), 500
+
+@student_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_students():
+    try:
+        return bulk_request(bulk_update, 'students')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error updating students", "error": str(e)}), 500
+
+@student_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_delete_students():
+    try:
+        return bulk_request(bulk_delete, 'students')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error deleting students", "error": str(e)}), 500
+
 @student_bp.route('/<student_id>', methods=['GET'])
 @jwt_required()
+@conditional('students')
+@cached('students')
 def get_student_by_id(student_id):
     try:
-        student = mongo.db.students.find_one({"_id": ObjectId(student_id)})
+        student = mongo.db.students.find_one({"_id": ObjectId(student_id)}, without_claims())
         if not student:
             return jsonify({"error": "Student not found"}), 404
         
@@ -68,16 +97,17 @@ def get_student_by_id(student_id):
 def update_student(student_id):
     try:
         data = request.get_json()
-        result = mongo.db.students.update_one(
+        # Update and return the updated document without a second read
+        student = mongo.db.students.find_one_and_update(
             {"_id": ObjectId(student_id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count == 0:
+        if not student:
             return jsonify({"error": "Student not found"}), 404
+        bump_version('students')
         
-        # Get the updated document
-        student = mongo.db.students.find_one({"_id": ObjectId(student_id)})
         student = serialize_document(student)
         
         return jsonify({
@@ -91,9 +121,10 @@ def update_student(student_id):
 @jwt_required()
 def delete_student(student_id):
     try:
-        result = mongo.db.students.delete_one({"_id": ObjectId(student_id)})
+        result = mongo.db.students.delete_one({"_id": ObjectId(student_id), **unclaimed()})
         if result.deleted_count == 0:
             return jsonify({"error": "Student not found"}), 404
+        bump_version('students')
         
         return jsonify({"message": "Student deleted"}), 200
     except Exception as e:
@@ -4,25 +4,13 @@ from bson.objectid import ObjectId
 from flask_jwt_extended import jwt_required
 from middleware.auth import authenticate_token
 from models.user import User
+from services.passwords import PasswordHasherBusy
+from utils.pagination import paginate, PaginationError
+from utils.streaming import wants_stream, ndjson_response
+from utils.serialization import serialize_document
 
 users_bp = Blueprint('users', __name__)
 
-# Utility function to serialize MongoDB documents
-def serialize_document(doc):
-    """
-    Converts MongoDB document ObjectId fields to strings for JSON serialization.
-    Adds an 'id' field that mirrors the '_id' field.
-    """
-    if not doc:
-        return doc
-    if "_id" in doc:
-        doc["_id"] = str(doc["_id"])
-        doc["id"] = doc["_id"]  # Add 'id' field
-    for key, value in doc.items():
-        if isinstance(value, ObjectId):
-            doc[key] = str(value)
-    return doc
-
 #
 @users_bp.route('/details', methods=['POST'])
 @authenticate_token
@@ -36,6 +24,8 @@ def add_user():
             "message": "User added successfully", 
             "user": user.to_json()
         }), 201
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         return jsonify({"message": "Error adding user", "error": str(e)}), 400
 
@@ -43,10 +33,13 @@ def add_user():
 @jwt_required()
 def get_users():
     try:
-        users = list(mongo.db.users.find())
-        # Serialize each user document
-        users = [serialize_document(user) for user in users]
-        return jsonify(users), 200
+        if wants_stream():
+            return ndjson_response(mongo.db.users, serializer=serialize_document)
+
+        page = paginate(mongo.db.users, serializer=serialize_document)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Error fetching users", "error": str(e)}), 500
     
@@ -54,9 +47,12 @@ def get_users():
 @jwt_required()
 def get_all_users():
     try:
-        users = list(mongo.db.users.find())
-        # Serialize each user document
-        users = [serialize_document(user) for user in users]
-        return jsonify(users), 200
+        if wants_stream():
+            return ndjson_response(mongo.db.users, serializer=serialize_document)
+
+        page = paginate(mongo.db.users, serializer=serialize_document)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Error fetching users", "error": str(e)}), 500
@@ -1,21 +1,20 @@
 from flask import Blueprint, request, jsonify
 from config.database import mongo
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
 from flask_jwt_extended import jwt_required
 from models.volunteer import Volunteer  # Import the model to trigger signals
+from utils.pagination import paginate, PaginationError
+from utils.streaming import wants_stream, ndjson_response
+from utils.serialization import serialize_document
+from utils.conditional import conditional, bump_version
+from utils.response_cache import cached
+from utils.bulk import bulk_request, BulkBodyError
+from services.bulk import bulk_insert, bulk_update, bulk_delete, unclaimed, without_claims
 
 volunteers_bp = Blueprint('volunteers', __name__)
 
-# Utility function to serialize MongoDB documents
-def serialize_document(doc):
-    """Converts MongoDB ObjectId fields to strings for JSON serialization."""
-    if not doc:
-        return doc
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])
-        doc["_id"] = str(doc["_id"])
-    return doc
-
 @volunteers_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_volunteer():
@@ -23,11 +22,9 @@ def create_volunteer():
         data = request.get_json()
         
         # Remove manual datetime handling - let the model handle it
-        result = mongo.db.volunteers.insert_one(data)
-        volunteer_id = str(result.inserted_id)
-
-        volunteer = mongo.db.volunteers.find_one({"_id": ObjectId(volunteer_id)})
-        volunteer = serialize_document(volunteer)
+        mongo.db.volunteers.insert_one(data)
+        bump_version('volunteers')
+        volunteer = serialize_document(data)
         
         return jsonify({
             "message": "Volunteer created successfully",
@@ -36,24 +33,63 @@ def create_volunteer():
     except Exception as e:
         return jsonify({"message": "Error creating volunteer", "error": str(e)}), 500
 
+
+# Bulk create, update or delete volunteers from a JSON array or an NDJSON body
+@volunteers_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_volunteers():
+    try:
+        return bulk_request(bulk_insert, 'volunteers')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error creating volunteers", "error": str(e)}), 500
+
+@volunteers_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_volunteers():
+    try:
+        return bulk_request(bulk_update, 'volunteers')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error updating volunteers", "error": str(e)}), 500
+
+@volunteers_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_delete_volunteers():
+    try:
+        return bulk_request(bulk_delete, 'volunteers')
+    except BulkBodyError as e:
+        return jsonify({"message": "Invalid bulk request body", "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Error deleting volunteers", "error": str(e)}), 500
+
 # Get all volunteers
 @volunteers_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('volunteers')
+@cached('volunteers')
 def get_volunteers():
     try:
-        volunteers = list(mongo.db.volunteers.find())
-        # Serialize each volunteer document
-        volunteers = [serialize_document(volunteer) for volunteer in volunteers]
-        return jsonify(volunteers), 200
+        if wants_stream():
+            return ndjson_response(mongo.db.volunteers, serializer=serialize_document)
+
+        page = paginate(mongo.db.volunteers, serializer=serialize_document)
+        return jsonify(page), 200
+    except PaginationError as e:
+        return jsonify({"message": "Invalid pagination parameters", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Error fetching volunteers", "error": str(e)}), 500
 
 # Get a volunteer by ID
 @volunteers_bp.route('/<id>', methods=['GET'])
 @jwt_required()
+@conditional('volunteers')
+@cached('volunteers')
 def get_volunteer(id):
     try:
-        volunteer = mongo.db.volunteers.find_one({"_id": ObjectId(id)})
+        volunteer = mongo.db.volunteers.find_one({"_id": ObjectId(id)}, without_claims())
         if not volunteer:
             return jsonify({"message": "Volunteer not found"}), 404
 
@@ -70,15 +106,16 @@ def get_volunteer(id):
 def update_volunteer(id):
     try:
         data = request.get_json()
-        result = mongo.db.volunteers.update_one(
+        # Update and return the updated volunteer without a second read
+        volunteer = mongo.db.volunteers.find_one_and_update(
             {"_id": ObjectId(id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if not volunteer:
             return jsonify({"message": "Volunteer not found"}), 404
+        bump_version('volunteers')
 
-        # Fetch the updated volunteer
-        volunteer = mongo.db.volunteers.find_one({"_id": ObjectId(id)})
         volunteer = serialize_document(volunteer)
 
         return jsonify(volunteer), 200
@@ -99,14 +136,13 @@ def delete_volunteer(volunteer_id):
             print("Invalid volunteer ID")  # Debug log
             return jsonify({"message": "Invalid volunteer ID"}), 400
 
-        # Check if the volunteer exists
-        volunteer = mongo.db.volunteers.find_one({"_id": volunteer_id})
+        # Delete the volunteer, None if it did not exist
+        volunteer = mongo.db.volunteers.find_one_and_delete({"_id": volunteer_id, **unclaimed()}, projection={"_id": 1})
         if not volunteer:
             print("Volunteer not found")  # Debug log
             return jsonify({"message": "Volunteer not found"}), 404
 
-        # Delete the volunteer
-        mongo.db.volunteers.delete_one({"_id": volunteer_id})
+        bump_version('volunteers')
         print("Volunteer deleted successfully")  # Debug log
         return jsonify({"message": "Volunteer deleted successfully"}), 200
     except Exception as e:
@@ -1,9 +1,14 @@
 import graphene
+from graphene import relay
 from graphene_mongo import MongoengineObjectType
+from graphql import GraphQLError
 from models.user import User
 from models.donor import Donor
 from models.volunteer import Volunteer
 from models.student import Student
+from loaders import load_by_id
+from connections import keyset_connection
+from services.blood_types import normalize_blood_type
 
 class UserType(MongoengineObjectType):
     class Meta:
@@ -21,42 +26,69 @@ class StudentType(MongoengineObjectType):
     class Meta:
         model = Student
 
+class UserConnection(relay.Connection):
+    class Meta:
+        node = UserType
+
+class DonorConnection(relay.Connection):
+    class Meta:
+        node = DonorType
+
+class VolunteerConnection(relay.Connection):
+    class Meta:
+        node = VolunteerType
+
+class StudentConnection(relay.Connection):
+    class Meta:
+        node = StudentType
+
 class Query(graphene.ObjectType):
-    users = graphene.List(UserType)
+    users = relay.ConnectionField(UserConnection)
     user = graphene.Field(UserType, id=graphene.String())
     
-    donors = graphene.List(DonorType)
+    donors = relay.ConnectionField(DonorConnection, blood_type=graphene.String(), district=graphene.String())
     donor = graphene.Field(DonorType, id=graphene.String())
     
-    volunteers = graphene.List(VolunteerType)
+    volunteers = relay.ConnectionField(VolunteerConnection, district=graphene.String())
     volunteer = graphene.Field(VolunteerType, id=graphene.String())
     
-    students = graphene.List(StudentType)
+    students = relay.ConnectionField(StudentConnection)
     student = graphene.Field(StudentType, id=graphene.String())
 
-    def resolve_users(self, info):
-        return User.objects.all()
+    def resolve_users(self, info, **kwargs):
+        return keyset_connection(UserConnection, User.objects, info, **kwargs)
 
     def resolve_user(self, info, id):
-        return User.objects.get(id=id)
-
-    def resolve_donors(self, info):
-        return Donor.objects.all()
+        return load_by_id(info, User, id)
+
+    def resolve_donors(self, info, blood_type=None, district=None, **kwargs):
+        queryset = Donor.objects
+        if blood_type is not None:
+            normalized = normalize_blood_type(blood_type)
+            if not normalized:
+                raise GraphQLError(f"Unknown blood type: {blood_type}")
+            queryset = queryset.filter(blood_type=normalized)
+        if district is not None:
+            queryset = queryset.filter(district=district)
+        return keyset_connection(DonorConnection, queryset, info, **kwargs)
 
     def resolve_donor(self, info, id):
-        return Donor.objects.get(id=id)
+        return load_by_id(info, Donor, id)
 
-    def resolve_volunteers(self, info):
-        return Volunteer.objects.all()
+    def resolve_volunteers(self, info, district=None, **kwargs):
+        queryset = Volunteer.objects
+        if district is not None:
+            queryset = queryset.filter(district=district)
+        return keyset_connection(VolunteerConnection, queryset, info, **kwargs)
 
     def resolve_volunteer(self, info, id):
-        return Volunteer.objects.get(id=id)
+        return load_by_id(info, Volunteer, id)
 
-    def resolve_students(self, info):
-        return Student.objects.all()
+    def resolve_students(self, info, **kwargs):
+        return keyset_connection(StudentConnection, Student.objects, info, **kwargs)
 
     def resolve_student(self, info, id):
-        return Student.objects.get(id=id)
+        return load_by_id(info, Student, id)
 
 class CreateUser(graphene.Mutation):
     class Arguments:
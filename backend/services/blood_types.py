@@ -0,0 +1,54 @@
+# services/blood_types.py
+import re
+
+# Canonical ABO/Rh blood types as stored on donor documents
+BLOOD_TYPES = ('O-', 'O+', 'A-', 'A+', 'B-', 'B+', 'AB-', 'AB+')
+
+_ABO_ANTIGENS = {
+    'O': frozenset(),
+    'A': frozenset({'A'}),
+    'B': frozenset({'B'}),
+    'AB': frozenset({'A', 'B'}),
+}
+
+_BLOOD_TYPE_RE = re.compile(
+    r'^\s*(AB|A|B|O|0)\s*(\+|-|POS(?:ITIVE)?|NEG(?:ATIVE)?|\+VE|-VE)?\s*$'
+)
+
+
+def _can_donate(donor, recipient):
+    """Red-cell compatibility: the donor may not carry antigens the recipient lacks."""
+    donor_abo, donor_rh = donor[:-1], donor[-1]
+    recipient_abo, recipient_rh = recipient[:-1], recipient[-1]
+    if not _ABO_ANTIGENS[donor_abo] <= _ABO_ANTIGENS[recipient_abo]:
+        return False
+    return donor_rh == '-' or recipient_rh == '+'
+
+
+# Recipient type -> donor types that can give to it, computed once at import
+COMPATIBLE_DONORS = {
+    recipient: tuple(donor for donor in BLOOD_TYPES if _can_donate(donor, recipient))
+    for recipient in BLOOD_TYPES
+}
+
+
+def normalize_blood_type(value):
+    """Return the canonical form of ``value`` (e.g. ``'ab neg'`` -> ``'AB-'``).
+
+    Returns None when the value cannot be recognised as a blood type.
+    """
+    if value is None:
+        return None
+    text = str(value)
+    match = _BLOOD_TYPE_RE.match(text.upper())
+    if not match:
+        return None
+
+    abo = 'O' if match.group(1) == '0' else match.group(1)
+    rh = match.group(2)
+    if rh is None:
+        # An unescaped '+' in a query string is decoded as a trailing space
+        if text.endswith(' '):
+            return abo + '+'
+        return None
+    return abo + ('-' if rh.startswith(('-', 'NEG')) else '+')
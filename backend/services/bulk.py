@@ -0,0 +1,253 @@
+# services/bulk.py
+"""Batched writes for the bulk endpoints and importers.
+
+Items are written in chunks with unordered ``insert_many``/``bulk_write`` so
+one bad document does not stop the rest of its chunk. Every function returns
+one result dict per input item, in input order, with its ``index``.
+
+An optional ``tracker`` (see ``services.inventory``) is told about every
+successful write as ``(before, after)`` pairs restricted to its ``fields``,
+once per chunk, so derived counters stay in step with the collection. Its
+``prepare`` is given each document or ``$set`` first to canonicalize the key fields.
+"""
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytz
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+INDIA_TZ = pytz.timezone('Asia/Kolkata')
+
+# Marks documents a bulk delete has claimed; the value is an ObjectId token
+CLAIM_FIELD = '_bulk_delete'
+
+# Claims older than this were left by a delete that died midway and are void
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+class ItemError:
+    """Stands in for an item that could not be decoded, e.g. a bad NDJSON line."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def unclaimed():
+    """Filter for documents no live bulk delete has claimed.
+
+    Single-document deletes add it too, so a document is only ever deleted,
+    and counted, by whoever claimed it.
+    """
+    expired = ObjectId.from_datetime(datetime.now(timezone.utc) - CLAIM_TIMEOUT)
+    return {"$or": [{CLAIM_FIELD: {"$exists": False}}, {CLAIM_FIELD: {"$lt": expired}}]}
+
+
+def without_claims(projection=None):
+    """Read projection that keeps ``CLAIM_FIELD`` out of documents sent to clients."""
+    if projection is None:
+        return {CLAIM_FIELD: 0}
+    if isinstance(projection, dict) and not any(value for field, value in projection.items() if field != '_id'):
+        # An exclusion projection; inclusion projections never select the claim
+        return {**projection, CLAIM_FIELD: 0}
+    return projection
+
+
+def stamp(doc):
+    """Set ``timeanddate`` the way the models' pre_save signal does."""
+    doc["timeanddate"] = datetime.now(INDIA_TZ)
+    return doc
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _object_id(value):
+    # ObjectId(None) would generate a fresh id rather than fail
+    if value is None:
+        return None
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _error(index, message):
+    return {"index": index, "status": "error", "error": message}
+
+
+def _tracked(doc, tracker):
+    return {field: doc.get(field) for field in tracker.fields}
+
+
+def _lookup(collection, ids, tracker):
+    """Existing, unclaimed documents among ``ids``, keyed by _id, with the tracker's fields."""
+    projection = {field: 1 for field in tracker.fields} if tracker else {"_id": 1}
+    return {doc["_id"]: doc for doc in collection.find({"_id": {"$in": ids}, **unclaimed()}, projection)}
+
+
+def bulk_insert(collection, items, chunk_size=500, tracker=None):
+    """Insert dict ``items``; results carry the new ``id`` or the write error."""
+    results = []
+    for offset, chunk in enumerate(chunked(items, chunk_size)):
+        base = offset * chunk_size
+        docs, positions = [], []
+        for i, item in enumerate(chunk):
+            if isinstance(item, ItemError):
+                results.append(_error(base + i, item.message))
+                continue
+            if not isinstance(item, dict):
+                results.append(_error(base + i, "Item must be a JSON object"))
+                continue
+            item.pop("_id", None)
+            item.pop(CLAIM_FIELD, None)
+            if tracker:
+                tracker.prepare(item)
+            docs.append(stamp(item))
+            positions.append(base + i)
+        if not docs:
+            continue
+
+        failed = {}
+        try:
+            collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        changes = []
+        for i, (doc, index) in enumerate(zip(docs, positions)):
+            if i in failed:
+                results.append(_error(index, failed[i]))
+            else:
+                results.append({"index": index, "status": "created", "id": str(doc["_id"])})
+                if tracker:
+                    changes.append((None, _tracked(doc, tracker)))
+        if tracker and changes:
+            tracker.apply(collection.database, changes)
+    results.sort(key=lambda result: result["index"])
+    return results
+
+
+def bulk_update(collection, items, chunk_size=500, tracker=None):
+    """Apply ``$set`` of each item's fields to the document with its ``id``."""
+    results = []
+    for offset, chunk in enumerate(chunked(items, chunk_size)):
+        base = offset * chunk_size
+        updates = {}
+        for i, item in enumerate(chunk):
+            if isinstance(item, ItemError):
+                results.append(_error(base + i, item.message))
+                continue
+            object_id = _object_id(item.get("id")) if isinstance(item, dict) else None
+            if object_id is None:
+                results.append(_error(base + i, "Item must be an object with a valid id"))
+                continue
+            fields = {k: v for k, v in item.items() if k not in ("id", "_id", CLAIM_FIELD)}
+            if tracker:
+                tracker.prepare(fields)
+            updates[base + i] = (object_id, stamp(fields))
+        if not updates:
+            continue
+
+        # bulk_write only reports totals, so look up which ids exist first
+        ids = [object_id for object_id, _ in updates.values()]
+        existing = _lookup(collection, ids, tracker)
+        operations, indexes = [], []
+        for index, (object_id, fields) in updates.items():
+            if object_id not in existing:
+                results.append({"index": index, "status": "not_found", "id": str(object_id)})
+                continue
+            # A document claimed since the lookup is being deleted; leave it alone
+            operations.append(UpdateOne({"_id": object_id, **unclaimed()}, {"$set": fields}))
+            indexes.append(index)
+        if not operations:
+            continue
+
+        failed = {}
+        try:
+            collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        changes = []
+        for i, index in enumerate(indexes):
+            object_id, fields = updates[index]
+            if i in failed:
+                results.append({**_error(index, failed[i]), "id": str(object_id)})
+            else:
+                results.append({"index": index, "status": "updated", "id": str(object_id)})
+                if tracker:
+                    before = _tracked(existing[object_id], tracker)
+                    after = {**before, **{field: fields[field] for field in tracker.fields if field in fields}}
+                    changes.append((before, after))
+        if tracker and changes:
+            tracker.apply(collection.database, changes)
+    results.sort(key=lambda result: result["index"])
+    return results
+
+
+def bulk_delete(collection, ids, chunk_size=500, tracker=None):
+    """Delete documents by id; ``ids`` may be id strings or ``{"id": ...}`` objects.
+
+    Each chunk first claims the documents it will delete by tagging them with
+    a fresh token, then reads back what it claimed and deletes exactly those.
+    A document deleted concurrently by another request is never claimed, so
+    it is reported as ``not_found`` here and counted once by the tracker.
+    If the chunk fails after claiming, its claims are released again; only a
+    process dying mid-chunk leaves them for ``CLAIM_TIMEOUT``.
+    """
+    results = []
+    for offset, chunk in enumerate(chunked(ids, chunk_size)):
+        base = offset * chunk_size
+        targets = {}
+        for i, item in enumerate(chunk):
+            if isinstance(item, ItemError):
+                results.append(_error(base + i, item.message))
+                continue
+            object_id = _object_id(item.get("id") if isinstance(item, dict) else item)
+            if object_id is None:
+                results.append(_error(base + i, "Invalid id"))
+                continue
+            targets[base + i] = object_id
+        if not targets:
+            continue
+
+        chunk_ids = list(set(targets.values()))
+        token = ObjectId()
+        collection.update_many({"_id": {"$in": chunk_ids}, **unclaimed()}, {"$set": {CLAIM_FIELD: token}})
+        projection = {field: 1 for field in tracker.fields} if tracker else {"_id": 1}
+        try:
+            claimed = {
+                doc["_id"]: doc
+                for doc in collection.find({"_id": {"$in": chunk_ids}, CLAIM_FIELD: token}, projection)
+            }
+            if claimed:
+                collection.delete_many({"_id": {"$in": list(claimed)}, CLAIM_FIELD: token})
+                if tracker:
+                    tracker.apply(collection.database, [(_tracked(doc, tracker), None) for doc in claimed.values()])
+        except BaseException:
+            # Documents still here stay readable and deletable instead of claimed
+            collection.update_many({"_id": {"$in": chunk_ids}, CLAIM_FIELD: token}, {"$unset": {CLAIM_FIELD: ""}})
+            raise
+        reported = set()
+        for index, object_id in sorted(targets.items()):
+            # A repeated id is deleted once; later copies find nothing
+            status = "deleted" if object_id in claimed and object_id not in reported else "not_found"
+            reported.add(object_id)
+            results.append({"index": index, "status": status, "id": str(object_id)})
+    results.sort(key=lambda result: result["index"])
+    return results
+
+
+def summarize(results):
+    """Count results by status, e.g. ``{"created": 10, "error": 1}``."""
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return counts
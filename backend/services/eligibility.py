@@ -0,0 +1,95 @@
+# services/eligibility.py
+"""Donation history and the denormalized ``next_eligible_at`` on donors.
+
+Each recorded donation is stored in ``donations`` and pushes the donor's
+``last_donation_at``/``next_eligible_at`` forward with ``$max``, so events
+recorded late or out of order never move eligibility backwards. Donors who
+never donated have no ``next_eligible_at`` and count as eligible; the
+``eligible_now`` predicate is a single range on that field and is served by
+the donor indexes in ``services.indexes``.
+"""
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+DONATIONS_COLLECTION = 'donations'
+
+# Days a donor must wait after each kind of donation before giving again
+DEFAULT_DEFERRAL_DAYS = {
+    'whole_blood': 90,
+    'platelets': 7,
+    'plasma': 14,
+}
+
+
+class EligibilityError(ValueError):
+    """Raised for unknown donation types or unparseable or future donation dates."""
+
+
+def parse_donated_at(value, now=None):
+    """Parse an ISO 8601 donation time; naive values are taken as UTC, None means now."""
+    now = now or datetime.now(timezone.utc)
+    if value in (None, ''):
+        return now
+    if isinstance(value, datetime):
+        donated_at = value
+    else:
+        text = str(value)
+        if text.endswith(('Z', 'z')):
+            # JavaScript's toISOString(); fromisoformat only accepts Z from Python 3.11
+            text = text[:-1] + '+00:00'
+        try:
+            donated_at = datetime.fromisoformat(text)
+        except ValueError:
+            raise EligibilityError("donated_at must be an ISO 8601 date")
+    if not donated_at.tzinfo:
+        donated_at = donated_at.replace(tzinfo=timezone.utc)
+    # A future date would push next_eligible_at forward and $max never takes it back
+    if donated_at > now:
+        raise EligibilityError("donated_at cannot be in the future")
+    return donated_at
+
+
+def next_eligible_at(donated_at, donation_type, deferral_days=None):
+    deferral_days = deferral_days or DEFAULT_DEFERRAL_DAYS
+    if donation_type not in deferral_days:
+        raise EligibilityError(
+            f"Unknown donation type {donation_type!r}, expected one of {', '.join(sorted(deferral_days))}"
+        )
+    return donated_at + timedelta(days=deferral_days[donation_type])
+
+
+def eligible_now(now=None):
+    """Query fragment for donors who may donate at ``now`` (missing dates included)."""
+    return {"next_eligible_at": {"$not": {"$gt": now or datetime.now(timezone.utc)}}}
+
+
+def record_donation(db, donor_id, donation_type, donated_at=None, deferral_days=None):
+    """Record a donation by ``donor_id``; returns ``(donor, donation)`` or None if no such donor.
+
+    The event is inserted before the donor is updated, so a failure in
+    between leaves a donation without its eligibility change rather than a
+    deferred donor with no donation to explain it. If the donor does not
+    exist the event is removed again.
+    """
+    donated_at = parse_donated_at(donated_at)
+    eligible_at = next_eligible_at(donated_at, donation_type, deferral_days)
+
+    donation = {
+        "donor_id": donor_id,
+        "type": donation_type,
+        "donated_at": donated_at,
+        "next_eligible_at": eligible_at,
+    }
+    db[DONATIONS_COLLECTION].insert_one(donation)
+
+    donor = db.donors.find_one_and_update(
+        {"_id": donor_id},
+        {"$max": {"last_donation_at": donated_at, "next_eligible_at": eligible_at}},
+        projection={"name": 1, "blood_type": 1, "district": 1, "last_donation_at": 1, "next_eligible_at": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if donor is None:
+        db[DONATIONS_COLLECTION].delete_one({"_id": donation["_id"]})
+        return None
+    return donor, donation
@@ -0,0 +1,194 @@
+# services/export.py
+"""Columnar export of donors, volunteers and students.
+
+Documents are read from a PyMongo cursor ``batch_size`` at a time, turned
+into Arrow record batches with a fixed schema per collection and written
+incrementally as Parquet or Feather (Arrow IPC file), so memory stays at one
+batch regardless of collection size.
+"""
+from datetime import datetime, timezone
+
+from services.blood_types import normalize_blood_type
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+FORMATS = {
+    'parquet': 'application/vnd.apache.parquet',
+    'feather': 'application/vnd.apache.arrow.file',
+}
+
+# Columns per collection, in output order; everything but timeanddate is text
+COLUMNS = {
+    'donors': ('id', 'name', 'blood_type', 'contact', 'address', 'district', 'weight', 'timeanddate'),
+    'volunteers': ('id', 'name', 'contact', 'address', 'district', 'timeanddate'),
+    'students': ('id', 'name', 'age', 'branch', 'timeanddate'),
+}
+
+
+class ExportError(ValueError):
+    """Raised for unknown formats or columns, bad filters, or a missing pyarrow."""
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ExportError("Columnar export needs the 'pyarrow' package")
+
+
+def detect_format(filename=None, declared=None):
+    fmt = (declared or (filename or '').rsplit('.', 1)[-1] or 'parquet').lower()
+    if fmt == 'arrow':
+        fmt = 'feather'
+    if fmt not in FORMATS:
+        raise ExportError(f"Unsupported export format {fmt!r}, expected parquet or feather")
+    return fmt
+
+
+def select_columns(kind, columns=None):
+    if not columns:
+        return COLUMNS[kind]
+    unknown = [column for column in columns if column not in COLUMNS[kind]]
+    if unknown:
+        raise ExportError(f"Unknown {kind} columns: {', '.join(unknown)}")
+    return tuple(columns)
+
+
+def arrow_schema(columns):
+    _require_pyarrow()
+    return pa.schema([
+        (column, pa.timestamp('ms', tz='UTC') if column == 'timeanddate' else pa.string())
+        for column in columns
+    ])
+
+
+def _parse_date(value, name):
+    if value.endswith(('Z', 'z')):
+        # fromisoformat only accepts a Z suffix from Python 3.11
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ExportError(f"{name} must be an ISO 8601 date")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def build_query(kind, district=None, blood_type=None, since=None, until=None):
+    """Translate export filters into a MongoDB query."""
+    query = {}
+    if district:
+        query["district"] = district
+    if blood_type:
+        if kind != 'donors':
+            raise ExportError("blood_type can only filter donors")
+        normalized = normalize_blood_type(blood_type)
+        if normalized is None:
+            raise ExportError(f"Unknown blood type {blood_type!r}")
+        query["blood_type"] = normalized
+    if since or until:
+        query["timeanddate"] = {}
+        if since:
+            query["timeanddate"]["$gte"] = _parse_date(since, 'since')
+        if until:
+            query["timeanddate"]["$lt"] = _parse_date(until, 'until')
+    return query
+
+
+def _cell(column, value):
+    if value is None:
+        return None
+    if column == 'timeanddate':
+        return value if isinstance(value, datetime) else None
+    return str(value)
+
+
+def iter_record_batches(collection, columns, query=None, batch_size=10000):
+    """Yield Arrow record batches of at most ``batch_size`` rows."""
+    schema = arrow_schema(columns)
+    projection = {column: 1 for column in columns if column != 'id'}
+    cursor = collection.find(query or {}, projection, batch_size=batch_size)
+    try:
+        data = {column: [] for column in columns}
+        rows = 0
+        for doc in cursor:
+            doc["id"] = doc.get("_id")
+            for column in columns:
+                data[column].append(_cell(column, doc.get(column)))
+            rows += 1
+            if rows == batch_size:
+                yield pa.RecordBatch.from_pydict(data, schema=schema)
+                data = {column: [] for column in columns}
+                rows = 0
+        if rows:
+            yield pa.RecordBatch.from_pydict(data, schema=schema)
+    finally:
+        cursor.close()
+
+
+def _open_writer(schema, sink, fmt):
+    if fmt == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression='zstd')
+    return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+
+
+def write_export(batches, schema, sink, fmt, on_batch=None):
+    """Write record batches to ``sink`` (a path or binary file); returns the row count.
+
+    ``on_batch(rows_so_far)`` is called after each batch is written.
+    """
+    rows = 0
+    writer = _open_writer(schema, sink, fmt)
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+            if on_batch:
+                on_batch(rows)
+    finally:
+        writer.close()
+    return rows
+
+
+class _ChunkSink:
+    """Write-only file that holds bytes until ``drain`` hands them out."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_export_chunks(batches, schema, fmt):
+    """Yield the encoded file in pieces, one per record batch plus the footer."""
+    sink = _ChunkSink()
+    writer = _open_writer(schema, sink, fmt)
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
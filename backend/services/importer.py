@@ -0,0 +1,259 @@
+# services/importer.py
+"""Spreadsheet import of donors and volunteers.
+
+Rows are read lazily from CSV (``csv`` module) or XLSX (openpyxl read-only
+mode), validated and normalized against the model's fields, and inserted
+``batch_size`` at a time through ``services.bulk``. Reading is driven by
+the writer: the next rows are parsed only after the current batch has been
+acknowledged, so memory stays at one batch however long the file is and a
+slow database slows the import down instead of buffering rows.
+"""
+import csv
+import io
+import re
+import time
+
+from services.blood_types import normalize_blood_type
+from services.bulk import bulk_insert
+from services.inventory import donor_inventory
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+
+class ImportFormatError(ValueError):
+    """Raised for unknown file formats or files without a usable header row."""
+
+
+# Header spellings seen in camp spreadsheets -> model field
+HEADER_ALIASES = {
+    'full_name': 'name',
+    'donor_name': 'name',
+    'volunteer_name': 'name',
+    'blood_group': 'blood_type',
+    'bloodgroup': 'blood_type',
+    'group': 'blood_type',
+    'phone': 'contact',
+    'phone_number': 'contact',
+    'mobile': 'contact',
+    'mobile_number': 'contact',
+    'contact_number': 'contact',
+    'weight_kg': 'weight',
+    'weight_(kg)': 'weight',
+    'place': 'address',
+}
+
+_WEIGHT_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(kg|kgs|kilograms?|lb|lbs|pounds?)?\s*$', re.IGNORECASE)
+
+
+def normalize_header(header):
+    key = re.sub(r'[\s\-]+', '_', str(header or '').strip().lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets turn phone numbers and weights into floats
+        value = int(value)
+    text = ' '.join(str(value).split())
+    return text or None
+
+
+def normalize_contact(value):
+    """Strip formatting from a phone number; Indian numbers lose the +91/0 prefix."""
+    text = _text(value)
+    if text is None:
+        return None
+    digits = re.sub(r'\D', '', text)
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith('0'):
+        digits = digits[1:]
+    if not 7 <= len(digits) <= 15:
+        raise ValueError(f"invalid contact number {text!r}")
+    return digits if len(digits) == 10 or not text.startswith('+') else '+' + digits
+
+
+def normalize_weight(value):
+    """Parse ``'60'``, ``'60.5 kg'`` or ``'132 lbs'`` into kilograms, stored as text."""
+    text = _text(value)
+    if text is None:
+        return None
+    match = _WEIGHT_RE.match(text)
+    if not match:
+        raise ValueError(f"invalid weight {text!r}")
+    kg = float(match.group(1))
+    if match.group(2) and match.group(2).lower().startswith(('lb', 'pound')):
+        kg *= 0.45359237
+    if not 30 <= kg <= 250:
+        raise ValueError(f"weight {text!r} out of range")
+    return f"{kg:.1f}".rstrip('0').rstrip('.')
+
+
+def normalize_blood_type_field(value):
+    text = _text(value)
+    if text is None:
+        return None
+    blood_type = normalize_blood_type(text)
+    if blood_type is None:
+        raise ValueError(f"unknown blood type {text!r}")
+    return blood_type
+
+
+# Field -> normalizer, mirroring models.donor.Donor and models.volunteer.Volunteer
+SCHEMAS = {
+    'donors': {
+        'required': ('name',),
+        'tracker': donor_inventory,
+        'fields': {
+            'name': _text,
+            'blood_type': normalize_blood_type_field,
+            'contact': normalize_contact,
+            'address': _text,
+            # Kept as written: API writes and district filters match it verbatim
+            'district': _text,
+            'weight': normalize_weight,
+        },
+    },
+    'volunteers': {
+        'required': ('name',),
+        'fields': {
+            'name': _text,
+            'contact': normalize_contact,
+            'address': _text,
+            'district': _text,
+        },
+    },
+}
+
+
+def validate_row(row, schema):
+    """Return ``(document, errors)`` for a ``{field: raw value}`` row."""
+    doc, errors = {}, []
+    for field, normalize in schema['fields'].items():
+        try:
+            value = normalize(row.get(field))
+        except ValueError as e:
+            errors.append(f"{field}: {e}")
+            continue
+        if value is not None:
+            doc[field] = value
+    for field in schema['required']:
+        if field not in doc and not any(error.startswith(field + ':') for error in errors):
+            errors.append(f"{field}: required")
+    return doc, errors
+
+
+def detect_format(filename, declared=None):
+    fmt = (declared or filename.rsplit('.', 1)[-1]).lower()
+    if fmt not in ('csv', 'xlsx'):
+        raise ImportFormatError(f"Unsupported import format {fmt!r}, expected csv or xlsx")
+    return fmt
+
+
+def iter_csv_rows(fileobj):
+    """Yield ``{field: value}`` dicts from a binary CSV stream."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if not header:
+        raise ImportFormatError("The file has no header row")
+    fields = [normalize_header(column) for column in header]
+    for values in reader:
+        if any(value.strip() for value in values):
+            yield dict(zip(fields, values))
+        else:
+            yield None
+
+
+def iter_xlsx_rows(fileobj):
+    """Yield ``{field: value}`` dicts from the first sheet of an XLSX workbook."""
+    if openpyxl is None:
+        raise ImportFormatError("XLSX import needs the 'openpyxl' package")
+    workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header or not any(header):
+            raise ImportFormatError("The file has no header row")
+        fields = [normalize_header(column) for column in header]
+        for values in rows:
+            if any(value not in (None, '') for value in values):
+                yield dict(zip(fields, values))
+            else:
+                yield None
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, fmt):
+    """Rows of the file; blank rows come through as None to keep row numbers right."""
+    return iter_xlsx_rows(fileobj) if fmt == 'xlsx' else iter_csv_rows(fileobj)
+
+
+def run_import(collection, rows, kind, batch_size=1000):
+    """Validate ``rows`` and insert the valid ones into ``collection``.
+
+    A generator of event dicts, so callers can report while the import runs:
+    ``rejected`` for each row that failed validation or insertion (with its
+    spreadsheet row number, the header being row 1), ``progress`` after every
+    written batch and a final ``done``, both carrying the running totals.
+    """
+    schema = SCHEMAS[kind]
+    stats = {"rows": 0, "imported": 0, "rejected": 0, "skipped": 0, "seconds": 0.0}
+    started = time.monotonic()
+    batch, batch_rows = [], []
+
+    def flush():
+        for result in bulk_insert(collection, batch, chunk_size=len(batch), tracker=schema.get('tracker')):
+            if result["status"] == "created":
+                stats["imported"] += 1
+            else:
+                stats["rejected"] += 1
+                row_number, row = batch_rows[result["index"]]
+                yield {"event": "rejected", "row": row_number, "errors": [result["error"]], "values": row}
+        batch.clear()
+        batch_rows.clear()
+        stats["seconds"] = round(time.monotonic() - started, 3)
+        yield {"event": "progress", **stats}
+
+    for row_number, row in enumerate(rows, start=2):
+        if row is None:
+            stats["skipped"] += 1
+            continue
+        stats["rows"] += 1
+        doc, errors = validate_row(row, schema)
+        if errors:
+            stats["rejected"] += 1
+            yield {"event": "rejected", "row": row_number, "errors": errors, "values": row}
+            continue
+        batch.append(doc)
+        batch_rows.append((row_number, row))
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+
+    stats["seconds"] = round(time.monotonic() - started, 3)
+    yield {"event": "done", **stats}
+
+
+class RejectsWriter:
+    """CSV report of rejected rows: row number, errors, then the original columns."""
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._writer = None
+        self._columns = None
+
+    def write(self, event):
+        row = event["values"]
+        if self._writer is None:
+            self._columns = list(row.keys())
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['row', 'errors', *self._columns])
+        self._writer.writerow([event["row"], '; '.join(event["errors"]), *(row.get(column, '') for column in self._columns)])
@@ -0,0 +1,146 @@
+# services/indexes.py
+from datetime import datetime, timezone
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from models import User, Donor, Volunteer, Student
+from services.matching import MATCH_ANY_DISTRICT_INDEX, MATCH_INDEX
+from services.eligibility import eligible_now
+
+# Indexes for the raw collections the blueprints query through ``mongo.db``
+COLLECTION_INDEXES = {
+    'donors': [
+        IndexModel([('userId', ASCENDING)], name='userId'),
+        IndexModel(MATCH_INDEX, name='blood_type_district_timeanddate_next_eligible_at'),
+        IndexModel(MATCH_ANY_DISTRICT_INDEX, name='blood_type_timeanddate_next_eligible_at'),
+        IndexModel([('district', ASCENDING)], name='district'),
+        IndexModel([('next_eligible_at', ASCENDING)], name='next_eligible_at'),
+        IndexModel([('timeanddate', DESCENDING)], name='timeanddate'),
+    ],
+    'volunteers': [
+        IndexModel([('district', ASCENDING)], name='district'),
+        IndexModel([('timeanddate', DESCENDING)], name='timeanddate'),
+    ],
+    'students': [
+        IndexModel([('timeanddate', DESCENDING)], name='timeanddate'),
+    ],
+    'users': [
+        IndexModel([('email', ASCENDING)], name='email', unique=True),
+    ],
+    'donations': [
+        IndexModel([('donor_id', ASCENDING), ('_id', ASCENDING)], name='donor_id__id'),
+    ],
+}
+
+# Mongoengine models whose ``meta['indexes']`` should be ensured as well
+INDEXED_MODELS = (User, Donor, Volunteer, Student)
+
+_SAMPLE_ID = ObjectId()
+_SAMPLE_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Representative queries issued by the routes: (route, collection, filter, sort)
+ROUTE_QUERIES = [
+    ('GET /api/donors/', 'donors', {'_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+    ('GET /api/donors/?eligible=1', 'donors',
+     {**eligible_now(_SAMPLE_NOW), '_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+    ('GET /api/donors/user/<user_id>', 'donors', {'userId': _SAMPLE_ID}, None),
+    ('GET /api/donors/match', 'donors',
+     {'blood_type': 'AB-', 'district': 'sample'}, [('timeanddate', DESCENDING)]),
+    ('GET /api/donors/match (compatible types)', 'donors',
+     {'blood_type': {'$in': ['O-', 'A-', 'B-']}, 'district': 'sample'}, [('timeanddate', DESCENDING)]),
+    ('GET /api/donors/match (any district)', 'donors',
+     {'blood_type': {'$in': ['O-', 'A-', 'B-']}}, [('timeanddate', DESCENDING)]),
+    ('GET /api/donors/match?eligible=1', 'donors',
+     {'blood_type': 'AB-', 'district': 'sample', **eligible_now(_SAMPLE_NOW)}, [('timeanddate', DESCENDING)]),
+    ('DELETE /api/donors/<donor_id>', 'donors', {'_id': _SAMPLE_ID}, None),
+    ('GET /api/donors/<donor_id>/donations', 'donations',
+     {'donor_id': _SAMPLE_ID, '_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+    ('GET /api/volunteers/', 'volunteers', {'_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+    ('GET /api/volunteers/<id>', 'volunteers', {'_id': _SAMPLE_ID}, None),
+    ('GET /api/students/', 'students', {'_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+    ('GET /api/students/<student_id>', 'students', {'_id': _SAMPLE_ID}, None),
+    ('GET /api/users/', 'users', {'_id': {'$gt': _SAMPLE_ID}}, [('_id', ASCENDING)]),
+]
+
+# Queries issued through the mongoengine models: (route, model, filter)
+MODEL_QUERIES = [
+    ('POST /api/auth/login', User, {'email': 'sample@example.com'}),
+    ('POST /api/auth/register', User, {'email': 'sample@example.com'}),
+    ('GET /api/auth/me', User, {'_id': _SAMPLE_ID}),
+]
+
+
+def ensure_indexes(db):
+    """Create every declared index and return the names created per collection.
+
+    ``db`` is the handle the routes use (``mongo.db``); indexing the same
+    collections the routes read is the point of this step. Failures such as
+    duplicate keys blocking a unique index are reported rather than raised.
+    """
+    created = {}
+    for name, indexes in COLLECTION_INDEXES.items():
+        collection = db[name]
+        try:
+            created[collection.full_name] = collection.create_indexes(indexes)
+        except OperationFailure as e:
+            created[collection.full_name] = ["error: %s" % e]
+
+    for model in INDEXED_MODELS:
+        collection = model._get_collection()
+        try:
+            model.ensure_indexes()
+            created[collection.full_name] = sorted(collection.index_information())
+        except OperationFailure as e:
+            created[collection.full_name] = ["error: %s" % e]
+    return created
+
+
+def _plan_stages(plan):
+    """Yield every ``stage`` name found anywhere in an explain plan."""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def _winning_stages(cursor):
+    explain = cursor.explain()
+    return list(_plan_stages(explain.get('queryPlanner', {}).get('winningPlan', {})))
+
+
+def collscan_report(db):
+    """Explain each known route query and report the ones that scan a collection.
+
+    Returns a list of dicts with the route, the collection, the winning plan
+    stages and whether the plan contains a ``COLLSCAN``.
+    """
+    report = []
+    for route, name, query, sort in ROUTE_QUERIES:
+        collection = db[name]
+        cursor = collection.find(query).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        stages = _winning_stages(cursor)
+        report.append({
+            "route": route,
+            "collection": collection.full_name,
+            "stages": stages,
+            "collscan": 'COLLSCAN' in stages
+        })
+
+    for route, model, query in MODEL_QUERIES:
+        collection = model._get_collection()
+        stages = _winning_stages(collection.find(query).limit(1))
+        report.append({
+            "route": route,
+            "collection": collection.full_name,
+            "stages": stages,
+            "collscan": 'COLLSCAN' in stages
+        })
+    return report
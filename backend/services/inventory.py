@@ -0,0 +1,81 @@
+# services/inventory.py
+"""Donor counts per (district, blood type), maintained as writes happen.
+
+``donor_inventory`` holds one document per pair, ``{"_id": {"district": ...,
+"blood_type": ...}, "count": n}``. Donor write paths report what they changed
+and the affected pairs are adjusted with ``$inc`` in one ``bulk_write``, so
+reading the whole table costs one small query instead of a scan of donors.
+Concurrent updates of the same donor can make the counters drift;
+``rebuild`` recomputes them from the donors collection.
+"""
+from collections import Counter
+
+from pymongo import UpdateOne
+
+from services.blood_types import normalize_blood_type
+
+INVENTORY_COLLECTION = 'donor_inventory'
+
+
+class DonorInventory:
+
+    # Donor fields making up the counter key; bulk writers read these before changing a donor
+    fields = ('district', 'blood_type')
+
+    def _key(self, doc):
+        return tuple(doc.get(field) for field in self.fields)
+
+    def prepare(self, doc):
+        """Store the canonical blood type so ``'o pos'`` and ``'O+'`` share one counter."""
+        value = doc.get('blood_type')
+        if isinstance(value, str):
+            doc['blood_type'] = normalize_blood_type(value) or value
+        return doc
+
+    def apply(self, db, changes):
+        """Adjust counters for ``(before, after)`` donor pairs; None means absent."""
+        deltas = Counter()
+        for before, after in changes:
+            if before is not None:
+                deltas[self._key(before)] -= 1
+            if after is not None:
+                deltas[self._key(after)] += 1
+        operations = [
+            UpdateOne({"_id": dict(zip(self.fields, key))}, {"$inc": {"count": delta}}, upsert=True)
+            for key, delta in deltas.items() if delta
+        ]
+        if operations:
+            db[INVENTORY_COLLECTION].bulk_write(operations, ordered=False)
+
+    def rebuild(self, db):
+        """Recompute every counter from the donors collection; returns the pair count.
+
+        ``$out`` replaces the collection when the aggregation finishes, so an
+        ``apply`` that lands while it runs is lost. Run it while donors are not
+        being written, or run it again afterwards.
+        """
+        db.donors.aggregate([
+            {"$group": {
+                # $group drops missing fields from the key, apply stores them as None
+                "_id": {field: {"$ifNull": [f"${field}", None]} for field in self.fields},
+                "count": {"$sum": 1}
+            }},
+            {"$out": INVENTORY_COLLECTION}
+        ])
+        return db[INVENTORY_COLLECTION].count_documents({})
+
+    def stats(self, db, district=None):
+        """Counts nested by district then blood type, with per-type and overall totals."""
+        query = {"count": {"$gt": 0}}
+        if district:
+            query["_id.district"] = district
+        districts, blood_types, total = {}, Counter(), 0
+        for doc in db[INVENTORY_COLLECTION].find(query):
+            key, count = doc["_id"], doc["count"]
+            districts.setdefault(key.get("district"), {})[key.get("blood_type")] = count
+            blood_types[key.get("blood_type")] += count
+            total += count
+        return {"districts": districts, "blood_types": dict(blood_types), "total": total}
+
+
+donor_inventory = DonorInventory()
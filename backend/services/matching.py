@@ -0,0 +1,49 @@
+# services/matching.py
+from services.blood_types import COMPATIBLE_DONORS
+from services.bulk import without_claims
+from services.eligibility import eligible_now
+
+# Compound index backing match queries: equality on blood type and district,
+# then newest donors first, with next_eligible_at last so the "eligible now"
+# range is checked from the index keys
+MATCH_INDEX = [("blood_type", 1), ("district", 1), ("timeanddate", -1), ("next_eligible_at", 1)]
+
+# Same without district, for matches across all districts: with MATCH_INDEX
+# alone the timeanddate sort would have to be done in memory
+MATCH_ANY_DISTRICT_INDEX = [("blood_type", 1), ("timeanddate", -1), ("next_eligible_at", 1)]
+
+
+def find_matching_donors(collection, recipient, district=None, limit=20, eligible_at=None):
+    """Return up to ``limit`` donors who can give to a ``recipient`` type.
+
+    Donors of exactly the recipient's type come first, then the other
+    compatible types; each group is ordered by most recent ``timeanddate``.
+    Both groups are read in sort order from ``MATCH_INDEX``, or from
+    ``MATCH_ANY_DISTRICT_INDEX`` when no district is given (see
+    ``services.indexes``); the ``$in`` over several types is a merge of
+    per-type index ranges rather than an in-memory sort. With ``eligible_at`` only donors eligible at
+    that time are returned.
+    """
+    base_query = {}
+    if district:
+        base_query["district"] = district
+    if eligible_at is not None:
+        base_query.update(eligible_now(eligible_at))
+
+    exact = list(
+        collection.find({**base_query, "blood_type": recipient}, without_claims())
+        .sort("timeanddate", -1)
+        .limit(limit)
+    )
+
+    remaining = limit - len(exact)
+    other_types = [blood_type for blood_type in COMPATIBLE_DONORS[recipient] if blood_type != recipient]
+    others = []
+    if remaining > 0 and other_types:
+        others = list(
+            collection.find({**base_query, "blood_type": {"$in": other_types}}, without_claims())
+            .sort("timeanddate", -1)
+            .limit(remaining)
+        )
+
+    return exact + others
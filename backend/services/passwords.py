@@ -0,0 +1,220 @@
+# services/passwords.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from utils.metrics import register_metrics
+
+DEFAULT_ROUNDS = 12
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated and the request should back off."""
+
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check_password(hashed, password):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so request threads stay responsive.
+
+    At most ``max_pending`` operations may be queued or running at once;
+    beyond that ``PasswordHasherBusy`` is raised immediately instead of
+    letting requests pile up behind CPU-bound hashing. With ``workers=0``
+    hashing runs inline in the calling thread.
+
+    New hashes use ``rounds`` as the bcrypt cost; ``rehash_later`` migrates
+    hashes made with a different cost in the background after a login.
+    """
+
+    def __init__(self, workers=1, max_pending=8, timeout=10.0, rounds=DEFAULT_ROUNDS):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._executor = None
+        self._rehash_executor = None
+        self._pid = None
+        self.configure(workers, max_pending, timeout, rounds)
+
+    def configure(self, workers, max_pending, timeout, rounds=DEFAULT_ROUNDS):
+        self.shutdown()
+        self.workers = workers
+        self.max_pending = max(max_pending, 1)
+        self.timeout = timeout
+        self.rounds = rounds
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._rehashed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('PASSWORD_HASHER_WORKERS', 1),
+            app.config.get('PASSWORD_HASHER_MAX_PENDING', 8),
+            app.config.get('PASSWORD_HASHER_TIMEOUT', 10.0),
+            app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_ROUNDS)
+        )
+        app.extensions['password_hasher'] = self
+
+    def hash(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def verify(self, hashed, password):
+        if not hashed or password is None:
+            return False
+        return self._run(_check_password, hashed, password)
+
+    def needs_rehash(self, hashed):
+        """True if ``hashed`` was made with a cost other than ``self.rounds``."""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+    def rehash_later(self, hashed, password, store):
+        """Rehash ``password`` at the configured cost off the request thread.
+
+        ``store(old_hash, new_hash)`` persists the result. Rehashing is
+        opportunistic: if the pool is busy it is skipped and retried on the
+        next successful login.
+        """
+        if not self.needs_rehash(hashed):
+            return
+
+        def job():
+            try:
+                new_hash = self.hash(password)
+            except PasswordHasherBusy:
+                return
+            store(hashed, new_hash)
+            with self._stats_lock:
+                self._rehashed += 1
+
+        self._get_rehash_executor().submit(job)
+
+    def metrics(self):
+        completed = self._completed
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self._pending,
+            "completed": completed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "rehashed": self._rehashed,
+            "rounds": self.rounds,
+            "avg_latency_ms": round(self._latency_total / completed * 1000, 2) if completed else 0.0,
+            "max_latency_ms": round(self._latency_max * 1000, 2)
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                if self._rehash_executor is not None:
+                    self._rehash_executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._rehash_executor = None
+            self._pid = None
+
+    def _forget_inherited_executors(self):
+        # Pools started by a parent process are unusable after fork()
+        if self._pid != os.getpid():
+            self._executor = None
+            self._rehash_executor = None
+            self._pid = os.getpid()
+
+    def _get_rehash_executor(self):
+        with self._lock:
+            self._forget_inherited_executors()
+            if self._rehash_executor is None:
+                self._rehash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rehash')
+            return self._rehash_executor
+
+    def _get_executor(self):
+        with self._lock:
+            self._forget_inherited_executors()
+            if self._executor is None:
+                # 'spawn' keeps pool processes independent of the threads and
+                # sockets of the web worker that starts them
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _release(self, slots, started, succeeded):
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._pending -= 1
+            if succeeded:
+                self._completed += 1
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+        slots.release()
+
+    def _run(self, fn, *args):
+        # configure() may swap the semaphore while a job is still running
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        with self._stats_lock:
+            self._pending += 1
+        started = time.perf_counter()
+
+        if self.workers <= 0:
+            succeeded = False
+            try:
+                result = fn(*args)
+                succeeded = True
+                return result
+            finally:
+                self._release(slots, started, succeeded)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._release(slots, started, False)
+            self.shutdown()
+            raise
+        except BaseException:
+            self._release(slots, started, False)
+            raise
+
+        # The slot is held until the job actually leaves the pool, so jobs
+        # that outlive their caller still count against max_pending
+        future.add_done_callback(
+            lambda done: self._release(slots, started, not done.cancelled() and done.exception() is None)
+        )
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drops the job if it has not started; a running one keeps its slot until it ends
+            future.cancel()
+            with self._stats_lock:
+                self._timed_out += 1
+            raise PasswordHasherBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+
+password_hasher = PasswordHasher()
+register_metrics('password_hasher', password_hasher.metrics)
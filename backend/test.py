@@ -153,7 +153,7 @@ class APITester:
         try:
             response = requests.get(f"{BASE_URL}/students/", headers=headers, timeout=5)
             if response.status_code == 200:
-                students = response.json()
+                students = response.json().get("items", [])
                 print(f"✓ Retrieved {len(students)} students")
                 if isinstance(students, list):
                     for student in students:
@@ -252,7 +252,7 @@ class APITester:
         try:
             response = requests.get(f"{BASE_URL}/donors/", headers=headers, timeout=5)
             if response.status_code == 200:
-                donors = response.json()
+                donors = response.json().get("items", [])
                 print(f"✓ Retrieved {len(donors)} donors")
                 for donor in donors:
                     print(f"   Donor ID: {donor.get('_id')}")
@@ -315,7 +315,7 @@ class APITester:
         try:
             response = requests.get(f"{BASE_URL}/volunteers/", headers=headers, timeout=5)
             if response.status_code == 200:
-                volunteers = response.json()
+                volunteers = response.json().get("items", [])
                 print(f"✓ Retrieved {len(volunteers)} volunteers")
                 for volunteer in volunteers:
                     print(f"   Volunteer ID: {volunteer.get('_id')}")
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import mongomock
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db():
+    """A fresh in-memory database per test."""
+    return mongomock.MongoClient().get_database('test')
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(PAGINATION_DEFAULT_LIMIT=50, PAGINATION_MAX_LIMIT=500)
+    return app
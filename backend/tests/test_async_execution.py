@@ -0,0 +1,28 @@
+import pytest
+from graphql import parse
+
+from async_execution import runs_concurrently
+
+NODE = "edges { node { name } }"
+
+
+@pytest.mark.parametrize('query, expected', [
+    ("{ donors { %s } }" % NODE, False),
+    ("{ donors { %s } volunteers { %s } }" % (NODE, NODE), True),
+    # Aliases are separate root fields, repeated keys are merged into one
+    ("{ a: donors { %s } b: donors { %s } }" % (NODE, NODE), True),
+    ("{ donors { %s } donors { %s } }" % (NODE, NODE), False),
+    ("query { ...Both } fragment Both on Query { donors { %s } volunteers { %s } }" % (NODE, NODE), True),
+    ("{ ... on Query { donors { %s } } }" % NODE, False),
+    ('mutation { a: login(email: "x", password: "y") { token } b: login(email: "x", password: "y") { token } }', False),
+])
+def test_runs_concurrently(query, expected):
+    assert runs_concurrently(parse(query)) is expected
+
+
+def test_selected_operation_decides():
+    document = parse("query One { donors { %s } } query Two { donors { %s } volunteers { %s } }" % (NODE, NODE, NODE))
+    assert runs_concurrently(document, 'One') is False
+    assert runs_concurrently(document, 'Two') is True
+    # Ambiguous without an operation name; execution reports that error itself
+    assert runs_concurrently(document) is False
@@ -0,0 +1,61 @@
+import pytest
+
+from services.blood_types import BLOOD_TYPES, COMPATIBLE_DONORS, normalize_blood_type
+from services.matching import find_matching_donors
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('O+', 'O+'),
+    ('o+', 'O+'),
+    ('ab neg', 'AB-'),
+    ('AB NEGATIVE', 'AB-'),
+    ('O+ve', 'O+'),
+    ('b -ve', 'B-'),
+    ('0-', 'O-'),
+    (' a pos ', 'A+'),
+    # '+' decoded from an unescaped query string becomes a space
+    ('AB ', 'AB+'),
+])
+def test_normalize_blood_type(raw, expected):
+    assert normalize_blood_type(raw) == expected
+
+
+@pytest.mark.parametrize('raw', [None, '', 'A', 'C+', 'XYZ', 'AB++'])
+def test_normalize_rejects_unknown(raw):
+    assert normalize_blood_type(raw) is None
+
+
+def test_universal_donor_and_recipient():
+    assert all('O-' in COMPATIBLE_DONORS[recipient] for recipient in BLOOD_TYPES)
+    assert set(COMPATIBLE_DONORS['AB+']) == set(BLOOD_TYPES)
+    assert COMPATIBLE_DONORS['O-'] == ('O-',)
+
+
+@pytest.mark.parametrize('recipient, donors', [
+    ('A+', {'O-', 'O+', 'A-', 'A+'}),
+    ('A-', {'O-', 'A-'}),
+    ('B+', {'O-', 'O+', 'B-', 'B+'}),
+    ('AB-', {'O-', 'A-', 'B-', 'AB-'}),
+])
+def test_compatibility_table(recipient, donors):
+    assert set(COMPATIBLE_DONORS[recipient]) == donors
+
+
+def test_matching_ranks_exact_type_first(db):
+    db.donors.insert_many([
+        {"name": "old exact", "blood_type": "A-", "timeanddate": 1},
+        {"name": "new universal", "blood_type": "O-", "timeanddate": 3},
+        {"name": "new exact", "blood_type": "A-", "timeanddate": 2},
+        {"name": "incompatible", "blood_type": "B-", "timeanddate": 4},
+    ])
+    names = [donor["name"] for donor in find_matching_donors(db.donors, 'A-')]
+    assert names == ["new exact", "old exact", "new universal"]
+
+
+def test_matching_respects_district_and_limit(db):
+    db.donors.insert_many([
+        {"name": f"d{i}", "blood_type": "O-", "district": "East" if i % 2 else "West", "timeanddate": i}
+        for i in range(6)
+    ])
+    donors = find_matching_donors(db.donors, 'AB+', district='East', limit=2)
+    assert [donor["name"] for donor in donors] == ["d5", "d3"]
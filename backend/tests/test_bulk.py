@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from services.bulk import (
+    CLAIM_FIELD, CLAIM_TIMEOUT, ItemError, bulk_delete, bulk_insert, bulk_update, summarize, unclaimed,
+    without_claims
+)
+from services.inventory import INVENTORY_COLLECTION, DonorInventory
+
+
+def test_insert_reports_each_item(db):
+    results = bulk_insert(db.donors, [{"name": "a"}, "oops", ItemError("Line 3: invalid JSON"), {"name": "b"}], chunk_size=2)
+    assert [r["status"] for r in results] == ["created", "error", "error", "created"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[1]["error"] == "Item must be a JSON object"
+    assert results[2]["error"] == "Line 3: invalid JSON"
+    assert db.donors.count_documents({}) == 2
+    assert summarize(results) == {"created": 2, "error": 2}
+
+
+def test_insert_drops_client_ids_and_claims(db):
+    results = bulk_insert(db.donors, [{"_id": "mine", CLAIM_FIELD: ObjectId(), "name": "a"}])
+    doc = db.donors.find_one()
+    assert str(doc["_id"]) == results[0]["id"]
+    assert CLAIM_FIELD not in doc
+    assert "timeanddate" in doc
+
+
+def test_update_reports_not_found_and_bad_ids(db):
+    existing = db.donors.insert_one({"name": "a"}).inserted_id
+    results = bulk_update(db.donors, [
+        {"id": str(existing), "name": "b"},
+        {"id": str(ObjectId()), "name": "c"},
+        {"id": "nope"},
+    ])
+    assert [r["status"] for r in results] == ["updated", "not_found", "error"]
+    assert db.donors.find_one({"_id": existing})["name"] == "b"
+
+
+def test_delete_reports_repeats_once(db):
+    first, second = db.donors.insert_many([{"name": "a"}, {"name": "b"}]).inserted_ids
+    results = bulk_delete(db.donors, [str(first), str(first), "bad", str(second), str(ObjectId())])
+    assert [r["status"] for r in results] == ["deleted", "not_found", "error", "deleted", "not_found"]
+    assert db.donors.count_documents({}) == 0
+
+
+def test_delete_skips_documents_claimed_elsewhere(db):
+    # Another bulk delete holds the claim, so this one must not report it as deleted
+    doc_id = db.donors.insert_one({"name": "a", CLAIM_FIELD: ObjectId()}).inserted_id
+    results = bulk_delete(db.donors, [str(doc_id)])
+    assert results[0]["status"] == "not_found"
+    assert db.donors.count_documents({}) == 1
+
+
+def test_stale_claims_expire(db):
+    stale = ObjectId.from_datetime(datetime.now(timezone.utc) - CLAIM_TIMEOUT - timedelta(minutes=1))
+    doc_id = db.donors.insert_one({"name": "a", CLAIM_FIELD: stale}).inserted_id
+    assert db.donors.count_documents(unclaimed()) == 1
+    assert bulk_delete(db.donors, [str(doc_id)])[0]["status"] == "deleted"
+
+
+def test_tracker_follows_bulk_writes(db):
+    tracker = DonorInventory()
+    results = bulk_insert(db.donors, [
+        {"district": "X", "blood_type": "O+"},
+        {"district": "X", "blood_type": "O+"},
+    ], tracker=tracker)
+    bulk_update(db.donors, [{"id": results[0]["id"], "blood_type": "A-"}], tracker=tracker)
+    bulk_delete(db.donors, [results[1]["id"]], tracker=tracker)
+    counts = {(doc["_id"]["district"], doc["_id"]["blood_type"]): doc["count"]
+              for doc in db[INVENTORY_COLLECTION].find()}
+    assert counts == {("X", "O+"): 0, ("X", "A-"): 1}
+
+
+def test_update_skips_claimed_documents(db):
+    doc_id = db.donors.insert_one({"name": "a", CLAIM_FIELD: ObjectId()}).inserted_id
+    assert bulk_update(db.donors, [{"id": str(doc_id), "name": "b"}])[0]["status"] == "not_found"
+    assert db.donors.find_one({"_id": doc_id})["name"] == "a"
+
+
+def test_failed_delete_releases_its_claims(db):
+    class FailingTracker(DonorInventory):
+        def apply(self, db, changes):
+            raise RuntimeError("inventory unavailable")
+
+    doc_id = db.donors.insert_one({"name": "a"}).inserted_id
+    other_claim = ObjectId()
+    claimed_elsewhere = db.donors.insert_one({"name": "b", CLAIM_FIELD: other_claim}).inserted_id
+    db.donors.delete_many = lambda *args, **kwargs: None  # the delete itself does not happen
+    with pytest.raises(RuntimeError):
+        bulk_delete(db.donors, [str(doc_id), str(claimed_elsewhere)], tracker=FailingTracker())
+    assert CLAIM_FIELD not in db.donors.find_one({"_id": doc_id})
+    assert db.donors.find_one({"_id": claimed_elsewhere})[CLAIM_FIELD] == other_claim
+
+
+@pytest.mark.parametrize('projection, expected', [
+    (None, {CLAIM_FIELD: 0}),
+    ({"_id": 0}, {"_id": 0, CLAIM_FIELD: 0}),
+    ({"password": 0}, {"password": 0, CLAIM_FIELD: 0}),
+    ({"name": 1}, {"name": 1}),
+    ({"name": 1, "_id": 0}, {"name": 1, "_id": 0}),
+])
+def test_without_claims(projection, expected):
+    assert without_claims(projection) == expected
@@ -0,0 +1,59 @@
+import pytest
+from graphql import GraphQLError, parse
+
+from cost import CostAnalyzer
+from schema import schema
+
+NODE = "edges { node { name } }"
+
+
+@pytest.fixture
+def analyzer():
+    return CostAnalyzer(schema.graphql_schema, max_cost=500, max_depth=5, default_page_size=50, max_page_size=500)
+
+
+def cost(analyzer, query, variables=None):
+    return analyzer.analyze(parse(query), variables).cost
+
+
+def test_unsized_connection_costs_a_default_page(analyzer):
+    assert cost(analyzer, "{ donors { %s } }" % NODE) == cost(analyzer, "{ donors(first: 50) { %s } }" % NODE)
+
+
+def test_aliased_unsized_connections_add_up(analyzer):
+    single = cost(analyzer, "{ donors { %s } }" % NODE)
+    aliases = " ".join("d%d: donors { %s }" % (i, NODE) for i in range(5))
+    assert cost(analyzer, "{ %s }" % aliases) == 5 * single
+
+    with pytest.raises(GraphQLError) as error:
+        analyzer.check(parse("{ %s }" % aliases))
+    assert error.value.extensions["code"] == "QUERY_TOO_COMPLEX"
+
+
+def test_page_size_scales_cost_and_is_capped(analyzer):
+    small = cost(analyzer, "{ donors(first: 10) { %s } }" % NODE)
+    large = cost(analyzer, "{ donors(first: 100) { %s } }" % NODE)
+    assert large > small
+    assert cost(analyzer, "{ donors(first: 100000) { %s } }" % NODE) == cost(
+        analyzer, "{ donors(first: 500) { %s } }" % NODE
+    )
+
+
+def test_last_and_variables_are_honoured(analyzer):
+    assert cost(analyzer, "{ donors(last: 10) { %s } }" % NODE) == cost(analyzer, "{ donors(first: 10) { %s } }" % NODE)
+    query = "query($n: Int) { donors(first: $n) { %s } }" % NODE
+    assert cost(analyzer, query, {"n": 10}) == cost(analyzer, "{ donors(first: 10) { %s } }" % NODE)
+    # Invalid sizes fall back to the default page
+    assert cost(analyzer, query, {"n": -1}) == cost(analyzer, "{ donors { %s } }" % NODE)
+
+
+def test_single_object_fields_are_not_multiplied(analyzer):
+    assert cost(analyzer, '{ donor(id: "x") { name } }') == 1
+
+
+def test_depth_limit(analyzer):
+    query = parse("{ donors { %s } }" % NODE)
+    assert analyzer.analyze(query).depth == 4
+    analyzer.max_depth = 3
+    with pytest.raises(GraphQLError, match='depth'):
+        analyzer.check(query)
@@ -0,0 +1,34 @@
+from mongoengine import connection as mongoengine_connection
+
+from config.database import MongoConnection
+
+
+class InheritedClient:
+    """Stands in for a client opened by the parent before fork()."""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_client_inherited_across_fork_is_dropped_not_closed():
+    mongo = MongoConnection('mongodb://localhost:27017/', 'test', connect=False)
+    mongo.register_mongoengine('fork-test')
+    inherited = InheritedClient()
+    mongo._client, mongo._pid = inherited, -1
+    mongoengine_connection._connections['fork-test'] = inherited
+
+    client = mongo.client
+    assert client is not inherited
+    assert not inherited.closed
+    assert 'fork-test' not in mongoengine_connection._connections
+    assert mongoengine_connection.get_connection('fork-test') is client
+    mongo.close()
+    mongoengine_connection.disconnect('fork-test')
+
+
+def test_client_is_reused_in_the_same_process():
+    mongo = MongoConnection('mongodb://localhost:27017/', 'test', connect=False)
+    assert mongo.client is mongo.client
+    mongo.close()
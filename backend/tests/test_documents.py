@@ -0,0 +1,50 @@
+import pytest
+from graphql import GraphQLError
+
+from documents import PERSISTED_QUERY_NOT_FOUND, DocumentCache, query_hash
+from schema import schema
+
+QUERY = "{ donors(first: 1) { edges { node { name } } } }"
+
+
+@pytest.fixture
+def documents():
+    return DocumentCache(schema.graphql_schema, maxsize=4, persisted_maxsize=4)
+
+
+@pytest.mark.parametrize('query', [123, ['{ donors }'], {'query': '{ donors }'}])
+def test_non_string_query_is_rejected(documents, query):
+    with pytest.raises(GraphQLError, match='Must provide query string'):
+        documents.resolve_query(query, None)
+
+
+def test_missing_query_is_rejected(documents):
+    with pytest.raises(GraphQLError, match='Must provide query string'):
+        documents.resolve_query(None, {})
+
+
+def test_persisted_query_round_trip(documents):
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(QUERY)}}
+    with pytest.raises(GraphQLError) as error:
+        documents.resolve_query(None, extensions)
+    assert error.value.extensions["code"] == PERSISTED_QUERY_NOT_FOUND
+
+    assert documents.resolve_query(QUERY, extensions) == QUERY
+    assert documents.resolve_query(None, extensions) == QUERY
+
+
+def test_hash_must_match_query(documents):
+    extensions = {"persistedQuery": {"sha256Hash": query_hash("{ other }")}}
+    with pytest.raises(GraphQLError, match='does not match'):
+        documents.resolve_query(QUERY, extensions)
+
+
+def test_documents_are_parsed_once(documents):
+    document, errors = documents.get_document(QUERY)
+    assert errors == []
+    assert documents.get_document(QUERY)[0] is document
+
+
+def test_syntax_errors_are_reported(documents):
+    document, errors = documents.get_document("{ donors(")
+    assert document is None and errors
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from services.eligibility import (
+    DONATIONS_COLLECTION, EligibilityError, eligible_now, next_eligible_at, parse_donated_at, record_donation
+)
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('donation_type, days', [('whole_blood', 90), ('platelets', 7), ('plasma', 14)])
+def test_next_eligible_at_defaults(donation_type, days):
+    assert next_eligible_at(NOW, donation_type) == NOW + timedelta(days=days)
+
+
+def test_next_eligible_at_configured_and_unknown():
+    assert next_eligible_at(NOW, 'plasma', {'plasma': 28}) == NOW + timedelta(days=28)
+    with pytest.raises(EligibilityError, match='Unknown donation type'):
+        next_eligible_at(NOW, 'bone_marrow')
+
+
+def test_next_eligible_at_crosses_leap_day():
+    donated_at = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert next_eligible_at(donated_at, 'whole_blood') == datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def test_parse_donated_at():
+    assert parse_donated_at(None, now=NOW) == NOW
+    assert parse_donated_at('', now=NOW) == NOW
+    # Naive values are taken as UTC
+    assert parse_donated_at('2026-02-01T08:30:00', now=NOW) == datetime(2026, 2, 1, 8, 30, tzinfo=timezone.utc)
+    assert parse_donated_at('2026-02-01T08:30:00+05:30', now=NOW) == datetime(2026, 2, 1, 3, 0, tzinfo=timezone.utc)
+    # JavaScript's toISOString()
+    assert parse_donated_at('2026-02-01T08:30:00.000Z', now=NOW) == datetime(2026, 2, 1, 8, 30, tzinfo=timezone.utc)
+    with pytest.raises(EligibilityError, match='ISO 8601'):
+        parse_donated_at('last tuesday', now=NOW)
+
+
+def test_parse_donated_at_rejects_future():
+    with pytest.raises(EligibilityError, match='future'):
+        parse_donated_at('2026-03-02', now=NOW)
+    with pytest.raises(EligibilityError, match='future'):
+        parse_donated_at(NOW + timedelta(seconds=1), now=NOW)
+
+
+def test_eligible_now_filter(db):
+    db.donors.insert_many([
+        {'name': 'never donated'},
+        {'name': 'deferred', 'next_eligible_at': NOW + timedelta(days=1)},
+        {'name': 'eligible', 'next_eligible_at': NOW - timedelta(days=1)},
+        {'name': 'eligible today', 'next_eligible_at': NOW},
+    ])
+    names = {doc['name'] for doc in db.donors.find(eligible_now(NOW))}
+    assert names == {'never donated', 'eligible', 'eligible today'}
+
+
+def test_record_donation_never_moves_eligibility_back(db):
+    donor_id = db.donors.insert_one({'name': 'a'}).inserted_id
+    recent = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    donor, donation = record_donation(db, donor_id, 'whole_blood', recent)
+    assert donation['next_eligible_at'] == recent + timedelta(days=90)
+
+    # A platelet donation recorded late, from before the whole blood one
+    donor, _ = record_donation(db, donor_id, 'platelets', recent - timedelta(days=10))
+    stored = db.donors.find_one({'_id': donor_id})
+    assert stored['next_eligible_at'] == (recent + timedelta(days=90)).replace(tzinfo=None)
+    assert stored['last_donation_at'] == recent.replace(tzinfo=None)
+    assert db[DONATIONS_COLLECTION].count_documents({'donor_id': donor_id}) == 2
+
+
+def test_record_donation_missing_donor_leaves_no_event(db):
+    assert record_donation(db, ObjectId(), 'plasma', '2026-01-01') is None
+    assert db[DONATIONS_COLLECTION].count_documents({}) == 0
+
+
+def test_record_donation_rejects_before_writing(db):
+    donor_id = db.donors.insert_one({'name': 'a'}).inserted_id
+    with pytest.raises(EligibilityError):
+        record_donation(db, donor_id, 'whole_blood', datetime.now(timezone.utc) + timedelta(days=1))
+    assert db[DONATIONS_COLLECTION].count_documents({}) == 0
+    assert 'next_eligible_at' not in db.donors.find_one({'_id': donor_id})
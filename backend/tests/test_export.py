@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.export import (
+    ExportError, arrow_schema, build_query, detect_format, iter_export_chunks, iter_record_batches,
+    select_columns, write_export
+)
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def donors(db):
+    db.donors.insert_many([
+        {"name": f"donor {i}", "blood_type": "O+" if i % 2 else "A-", "district": "Goa" if i < 3 else "Pune",
+         "weight": 60 + i, "timeanddate": START + timedelta(days=i)}
+        for i in range(5)
+    ])
+    db.donors.insert_one({"name": "no extras"})
+    return db.donors
+
+
+def read_back(data, fmt):
+    if fmt == 'parquet':
+        return pq.read_table(pa.BufferReader(data))
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+
+
+@pytest.mark.parametrize('filename, declared, expected', [
+    ('donors.parquet', None, 'parquet'),
+    (None, 'arrow', 'feather'),
+    ('donors.FEATHER', None, 'feather'),
+    (None, None, 'parquet'),
+])
+def test_detect_format(filename, declared, expected):
+    assert detect_format(filename, declared) == expected
+
+
+def test_detect_format_rejects_unknown():
+    with pytest.raises(ExportError):
+        detect_format('donors.csv')
+
+
+def test_select_columns():
+    assert select_columns('volunteers') == ('id', 'name', 'contact', 'address', 'district', 'timeanddate')
+    assert select_columns('donors', ['name', 'district']) == ('name', 'district')
+    with pytest.raises(ExportError, match='password'):
+        select_columns('donors', ['name', 'password'])
+
+
+@pytest.mark.parametrize('value', ['2024-01-01T00:00:00Z', '2024-01-01T00:00:00z', '2024-01-01T00:00:00',
+                                   '2024-01-01', '2024-01-01T05:30:00+05:30'])
+def test_build_query_dates_are_utc(value):
+    query = build_query('donors', since=value)
+    assert query == {"timeanddate": {"$gte": datetime(2024, 1, 1, tzinfo=timezone.utc)}}
+
+
+def test_build_query_filters():
+    query = build_query('donors', district='Goa', blood_type='o pos', until='2024-02-01')
+    assert query == {
+        "district": "Goa",
+        "blood_type": "O+",
+        "timeanddate": {"$lt": datetime(2024, 2, 1, tzinfo=timezone.utc)},
+    }
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'since': 'yesterday'},
+    {'blood_type': 'Q+'},
+])
+def test_build_query_rejects(kwargs):
+    with pytest.raises(ExportError):
+        build_query('donors', **kwargs)
+
+
+def test_blood_type_only_filters_donors():
+    with pytest.raises(ExportError):
+        build_query('volunteers', blood_type='O+')
+
+
+@pytest.mark.parametrize('batch_size, sizes', [(2, [2, 2, 2]), (3, [3, 3]), (6, [6]), (100, [6])])
+def test_batch_boundaries(donors, batch_size, sizes):
+    batches = list(iter_record_batches(donors, select_columns('donors'), batch_size=batch_size))
+    assert [batch.num_rows for batch in batches] == sizes
+
+
+def test_batches_hold_selected_columns(donors):
+    columns = select_columns('donors', ['id', 'weight', 'timeanddate'])
+    table = pa.Table.from_batches(list(iter_record_batches(donors, columns, batch_size=4)))
+    assert table.schema == arrow_schema(columns)
+    rows = table.to_pylist()
+    assert [row["id"] for row in rows] == [str(doc["_id"]) for doc in donors.find()]
+    # Everything but timeanddate is exported as text; missing values are null
+    assert rows[0]["weight"] == "60"
+    assert rows[0]["timeanddate"] == START
+    assert rows[-1]["weight"] is None and rows[-1]["timeanddate"] is None
+
+
+def test_batches_apply_filters(donors):
+    query = build_query('donors', district='Goa', since='2026-01-02T00:00:00Z')
+    table = pa.Table.from_batches(list(iter_record_batches(donors, ('name',), query, batch_size=1)))
+    assert table.column('name').to_pylist() == ['donor 1', 'donor 2']
+
+
+def test_no_matching_documents_yields_no_batches(donors):
+    assert list(iter_record_batches(donors, ('name',), {"district": "Nowhere"})) == []
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_streamed_chunks_read_back(donors, fmt):
+    columns = select_columns('donors')
+    batches = iter_record_batches(donors, columns, batch_size=2)
+    chunks = list(iter_export_chunks(batches, arrow_schema(columns), fmt))
+    # Data is handed out as batches are written, not only at the end
+    assert len(chunks) > 1
+    table = read_back(b''.join(chunks), fmt)
+    assert table.num_rows == 6
+    assert table.column_names == list(columns)
+    assert table.column('name').to_pylist()[:2] == ['donor 0', 'donor 1']
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_empty_export_is_a_valid_file(db, fmt):
+    columns = select_columns('students')
+    data = b''.join(iter_export_chunks(iter_record_batches(db.students, columns), arrow_schema(columns), fmt))
+    table = read_back(data, fmt)
+    assert table.num_rows == 0
+    assert table.column_names == list(columns)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_write_export_to_path(donors, tmp_path, fmt):
+    columns = select_columns('donors', ['name', 'district'])
+    progress = []
+    path = tmp_path / f"donors.{fmt}"
+    rows = write_export(iter_record_batches(donors, columns, batch_size=4), arrow_schema(columns),
+                        str(path), fmt, on_batch=progress.append)
+    assert rows == 6
+    assert progress == [4, 6]
+    assert read_back(path.read_bytes(), fmt).column('district').to_pylist().count('Goa') == 3
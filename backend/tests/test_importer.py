@@ -0,0 +1,130 @@
+import io
+
+import pytest
+
+from services.importer import (
+    SCHEMAS, ImportFormatError, RejectsWriter, detect_format, iter_csv_rows, normalize_blood_type_field,
+    normalize_contact, normalize_header, normalize_weight, run_import, validate_row
+)
+from services.inventory import INVENTORY_COLLECTION
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('98765 43210', '9876543210'),
+    ('+91 98765-43210', '9876543210'),
+    ('098765 43210', '9876543210'),
+    (9876543210.0, '9876543210'),
+    ('+44 20 7946 0958', '+442079460958'),
+    ('', None),
+    (None, None),
+])
+def test_normalize_contact(raw, expected):
+    assert normalize_contact(raw) == expected
+
+
+@pytest.mark.parametrize('raw', ['12345', '1234567890123456', 'call me'])
+def test_normalize_contact_rejects(raw):
+    with pytest.raises(ValueError):
+        normalize_contact(raw)
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('60', '60'),
+    ('60.5 kg', '60.5'),
+    ('132 lbs', '59.9'),
+    (72.0, '72'),
+    (None, None),
+])
+def test_normalize_weight(raw, expected):
+    assert normalize_weight(raw) == expected
+
+
+@pytest.mark.parametrize('raw', ['heavy', '20', '300 kg', '60 stone'])
+def test_normalize_weight_rejects(raw):
+    with pytest.raises(ValueError):
+        normalize_weight(raw)
+
+
+def test_blood_type_field():
+    assert normalize_blood_type_field(' o pos ') == 'O+'
+    assert normalize_blood_type_field('') is None
+    with pytest.raises(ValueError, match='unknown blood type'):
+        normalize_blood_type_field('Z+')
+
+
+def test_headers_use_aliases():
+    headers = ['Full Name', 'Blood-Group', 'Mobile Number', 'Weight (kg)', 'District']
+    assert [normalize_header(h) for h in headers] == ['name', 'blood_type', 'contact', 'weight', 'district']
+
+
+def test_validate_row_collects_every_error():
+    doc, errors = validate_row({'name': '', 'blood_type': 'Q', 'weight': '10'}, SCHEMAS['donors'])
+    assert doc == {}
+    assert sorted(error.split(':')[0] for error in errors) == ['blood_type', 'name', 'weight']
+
+
+def test_validate_row_normalizes():
+    doc, errors = validate_row({'name': ' Asha  Rao ', 'district': 'North  Goa', 'blood_type': 'ab neg'},
+                               SCHEMAS['donors'])
+    assert errors == []
+    assert doc == {'name': 'Asha Rao', 'district': 'North Goa', 'blood_type': 'AB-'}
+
+
+def test_district_case_is_kept():
+    # The API stores districts as sent, so an import must not re-case them
+    doc, _ = validate_row({'name': 'Asha', 'district': 'goa'}, SCHEMAS['donors'])
+    assert doc['district'] == 'goa'
+
+
+def test_detect_format():
+    assert detect_format('donors.CSV') == 'csv'
+    assert detect_format('upload', 'xlsx') == 'xlsx'
+    with pytest.raises(ImportFormatError):
+        detect_format('donors.ods')
+
+
+def test_csv_rows_keep_row_numbers():
+    source = io.BytesIO(b'\xef\xbb\xbfName,Phone\nAsha,9876543210\n,\nRavi,98765\n')
+    assert list(iter_csv_rows(source)) == [
+        {'name': 'Asha', 'contact': '9876543210'}, None, {'name': 'Ravi', 'contact': '98765'}
+    ]
+
+
+def test_csv_without_header():
+    with pytest.raises(ImportFormatError):
+        list(iter_csv_rows(io.BytesIO(b'')))
+
+
+def test_run_import_events(db):
+    rows = [
+        {'name': 'Asha', 'district': 'goa', 'blood_type': 'O+'},
+        None,
+        {'name': 'Ravi', 'blood_type': 'nope'},
+        {'name': 'Mira', 'district': 'goa', 'blood_type': 'o+'},
+        {'name': 'Kiran'},
+    ]
+    events = list(run_import(db.donors, rows, 'donors', batch_size=2))
+    kinds = [event['event'] for event in events]
+    assert kinds == ['rejected', 'progress', 'progress', 'done']
+
+    rejected = events[0]
+    assert rejected['row'] == 4
+    assert rejected['errors'][0].startswith('blood_type:')
+
+    done = events[-1]
+    assert (done['rows'], done['imported'], done['rejected'], done['skipped']) == (4, 3, 1, 1)
+    assert db.donors.count_documents({}) == 3
+    inventory = db[INVENTORY_COLLECTION].find_one({'_id': {'district': 'goa', 'blood_type': 'O+'}})
+    assert inventory['count'] == 2
+
+
+def test_rejects_writer():
+    out = io.StringIO()
+    writer = RejectsWriter(out)
+    writer.write({'row': 3, 'errors': ['name: required', 'weight: bad'], 'values': {'name': '', 'weight': 'x'}})
+    writer.write({'row': 7, 'errors': ['contact: bad'], 'values': {'name': 'Ravi', 'weight': '60'}})
+    assert out.getvalue().splitlines() == [
+        'row,errors,name,weight',
+        '3,name: required; weight: bad,,x',
+        '7,contact: bad,Ravi,60',
+    ]
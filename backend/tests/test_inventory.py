@@ -0,0 +1,57 @@
+from services.bulk import bulk_delete, bulk_insert, bulk_update
+from services.inventory import INVENTORY_COLLECTION, DonorInventory
+
+
+def _counts(db):
+    return {(doc["_id"].get("district"), doc["_id"].get("blood_type")): doc["count"]
+            for doc in db[INVENTORY_COLLECTION].find({"count": {"$gt": 0}})}
+
+
+def test_prepare_normalizes_blood_type():
+    inventory = DonorInventory()
+    assert inventory.prepare({"blood_type": "o pos"}) == {"blood_type": "O+"}
+    # Unrecognized values are kept as given rather than dropped
+    assert inventory.prepare({"blood_type": "unknown"}) == {"blood_type": "unknown"}
+    assert inventory.prepare({"name": "a"}) == {"name": "a"}
+
+
+def test_apply_matches_rebuild(db):
+    inventory = DonorInventory()
+    results = bulk_insert(db.donors, [
+        {"district": "Goa", "blood_type": "o+"},
+        {"district": "Goa", "blood_type": "O+"},
+        {"district": "Pune", "blood_type": "AB-"},
+        {"district": "Pune"},
+        {"blood_type": "A+"},
+        {"name": "no key fields"},
+    ], tracker=inventory)
+    bulk_update(db.donors, [{"id": results[2]["id"], "blood_type": "b neg"}], tracker=inventory)
+    bulk_delete(db.donors, [results[4]["id"]], tracker=inventory)
+
+    applied = _counts(db)
+    assert applied == {("Goa", "O+"): 2, ("Pune", "B-"): 1, ("Pune", None): 1, (None, None): 1}
+
+    inventory.rebuild(db)
+    assert _counts(db) == applied
+
+
+def test_apply_after_rebuild_uses_same_keys(db):
+    inventory = DonorInventory()
+    db.donors.insert_many([{"district": "Goa"}, {"blood_type": "O-"}])
+    inventory.rebuild(db)
+    inventory.apply(db, [(None, {"district": "Goa"}), (None, {"blood_type": "O-"})])
+    assert db[INVENTORY_COLLECTION].count_documents({}) == 2
+    assert _counts(db) == {("Goa", None): 2, (None, "O-"): 2}
+
+
+def test_stats(db):
+    inventory = DonorInventory()
+    inventory.apply(db, [
+        (None, {"district": "Goa", "blood_type": "O+"}),
+        (None, {"district": "Goa", "blood_type": "A+"}),
+        (None, {"district": "Pune", "blood_type": "O+"}),
+    ])
+    stats = inventory.stats(db)
+    assert stats["total"] == 3
+    assert stats["blood_types"] == {"O+": 2, "A+": 1}
+    assert inventory.stats(db, district="Pune")["districts"] == {"Pune": {"O+": 1}}
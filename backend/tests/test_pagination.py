@@ -0,0 +1,91 @@
+import bson
+import pytest
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from services.bulk import CLAIM_FIELD
+from utils.pagination import PaginationError, decode_cursor, encode_cursor, paginate, parse_page_args
+
+
+def test_cursor_round_trip():
+    object_id = ObjectId()
+    cursor = encode_cursor(object_id)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == object_id
+
+
+def test_cursor_accepts_string_ids():
+    object_id = ObjectId()
+    assert decode_cursor(encode_cursor(str(object_id))) == object_id
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor!', 'AAAA', '', 'é'])
+def test_invalid_cursor(cursor):
+    with pytest.raises(PaginationError):
+        decode_cursor(cursor)
+
+
+def test_page_args_defaults_and_clamping(app):
+    with app.test_request_context('/'):
+        assert parse_page_args() == (50, None)
+    with app.test_request_context('/?limit=10000'):
+        assert parse_page_args() == (500, None)
+
+
+@pytest.mark.parametrize('query', ['limit=abc', 'limit=0', 'limit=-3', 'after=bogus'])
+def test_page_args_rejects_bad_values(app, query):
+    with app.test_request_context('/?' + query):
+        with pytest.raises(PaginationError):
+            parse_page_args()
+
+
+def test_paginate_walks_every_document_once(app, db):
+    db.items.insert_many([{"n": i} for i in range(7)])
+    seen, cursor = [], None
+    while True:
+        url = '/?limit=3' + (f'&after={cursor}' if cursor else '')
+        with app.test_request_context(url):
+            page = paginate(db.items)
+        seen += [doc["n"] for doc in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(range(7))
+
+
+def test_paginate_applies_query_and_serializer(app, db):
+    db.items.insert_many([{"n": i, "even": i % 2 == 0} for i in range(6)])
+    with app.test_request_context('/'):
+        page = paginate(db.items, {"even": True}, serializer=lambda doc: doc["n"])
+    assert page == {"items": [0, 2, 4], "next_cursor": None, "limit": 50}
+
+
+class RawCollection:
+    """mongomock has no RawBSONDocument support; encode what aggregate returns."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def with_options(self, codec_options):
+        return self
+
+    def aggregate(self, pipeline):
+        return [RawBSONDocument(bson.encode(doc)) for doc in self.collection.aggregate(pipeline)]
+
+
+def test_bson_pages_carry_the_id_alias(app, db):
+    db.items.insert_many([{"n": i} for i in range(3)])
+    with app.test_request_context('/?limit=2', headers={'Accept': 'application/bson'}):
+        page = paginate(RawCollection(db.items), serializer=lambda doc: doc)
+    assert all(isinstance(doc, RawBSONDocument) for doc in page["items"])
+    assert [doc["n"] for doc in page["items"]] == [0, 1]
+    assert all(doc["id"] == doc["_id"] for doc in page["items"])
+    assert decode_cursor(page["next_cursor"]) == page["items"][-1]["_id"]
+
+
+def test_paginate_hides_bulk_delete_claims(app, db):
+    db.items.insert_one({"n": 1, CLAIM_FIELD: ObjectId()})
+    with app.test_request_context('/'):
+        page = paginate(db.items)
+    assert page["items"][0]["n"] == 1
+    assert CLAIM_FIELD not in page["items"][0]
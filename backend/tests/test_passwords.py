@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.passwords import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.05, rounds=4)
+    executor = ThreadPoolExecutor(max_workers=1)
+    # A thread pool stands in for the process pool; the slot accounting is the same
+    hasher._get_executor = lambda: executor
+    yield hasher
+    executor.shutdown(wait=True)
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes(hasher):
+    release = threading.Event()
+
+    with pytest.raises(PasswordHasherBusy, match='timed out'):
+        hasher._run(release.wait)
+    assert hasher.metrics()["queue_depth"] == 1
+    assert hasher.metrics()["timed_out"] == 1
+
+    # The abandoned job still occupies the only slot
+    with pytest.raises(PasswordHasherBusy, match='full'):
+        hasher._run(lambda: None)
+
+    release.set()
+    for _ in range(100):
+        if hasher.metrics()["queue_depth"] == 0:
+            break
+        time.sleep(0.01)
+    assert hasher.metrics()["queue_depth"] == 0
+    assert hasher._run(lambda: 'ok') == 'ok'
+
+
+def test_only_successes_count_as_completed(hasher):
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        hasher._run(fail)
+    assert hasher._run(lambda: 1) == 1
+    time.sleep(0.01)
+    metrics = hasher.metrics()
+    assert metrics["completed"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_inline_hash_and_verify():
+    hasher = PasswordHasher(workers=0, rounds=4)
+    hashed = hasher.hash('secret')
+    assert hasher.verify(hashed, 'secret')
+    assert not hasher.verify(hashed, 'wrong')
+    assert hasher.metrics()["completed"] == 3
+    assert hasher.needs_rehash(hashed) is False
+    hasher.rounds = 5
+    assert hasher.needs_rehash(hashed) is True
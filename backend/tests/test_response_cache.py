@@ -0,0 +1,110 @@
+import gzip
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from flask import jsonify
+
+import routes.donors
+import utils.conditional
+from utils.compression import compression
+from utils.conditional import bump_version, conditional
+from utils.response_cache import cached, response_cache
+
+NOW = [datetime(2026, 3, 1, 12, 0, 10, tzinfo=timezone.utc)]
+
+
+class FrozenDatetime(datetime):
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW[0]
+
+
+@pytest.fixture
+def client(app, db, monkeypatch):
+    monkeypatch.setattr(utils.conditional, 'mongo', SimpleNamespace(db=db))
+    monkeypatch.setattr(routes.donors, 'datetime', FrozenDatetime)
+    response_cache.init_app(app)
+    compression.init_app(app)
+    app.calls = 0
+
+    @app.route('/donors')
+    @conditional('donors', vary=routes.donors.eligibility_vary)
+    @cached('donors')
+    def donors():
+        app.calls += 1
+        return jsonify({"items": [{"name": "donor %d" % i} for i in range(100)], "call": app.calls})
+
+    return app.test_client()
+
+
+def test_miss_then_hit(client):
+    first = client.get('/donors')
+    second = client.get('/donors')
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert client.application.calls == 1
+
+
+def test_bump_version_invalidates(client):
+    before = client.get('/donors')
+    bump_version('donors')
+    after = client.get('/donors')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.headers['ETag'] != before.headers['ETag']
+    assert after.get_json()['call'] == 2
+    # Other collections keep their entries
+    bump_version('volunteers')
+    assert client.get('/donors').headers['X-Cache'] == 'HIT'
+
+
+def test_eligible_key_changes_every_minute(client):
+    NOW[0] = datetime(2026, 3, 1, 12, 0, 10, tzinfo=timezone.utc)
+    first = client.get('/donors?eligible=1')
+    NOW[0] = datetime(2026, 3, 1, 12, 0, 50, tzinfo=timezone.utc)
+    same_minute = client.get('/donors?eligible=1')
+    NOW[0] = datetime(2026, 3, 1, 12, 1, 5, tzinfo=timezone.utc)
+    next_minute = client.get('/donors?eligible=1')
+
+    assert [r.headers['X-Cache'] for r in (first, same_minute, next_minute)] == ['MISS', 'HIT', 'MISS']
+    assert same_minute.headers['ETag'] == first.headers['ETag'] != next_minute.headers['ETag']
+    # Time-dependent responses carry no Last-Modified, and do not share the plain list's key
+    assert 'Last-Modified' not in first.headers
+    assert client.get('/donors').headers['X-Cache'] == 'MISS'
+
+
+def test_gzip_variant_is_reused_on_hit(client):
+    compressed, reused = compression.compressed, compression.cache_hits
+    first = client.get('/donors', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/donors', headers={'Accept-Encoding': 'gzip'})
+
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.headers['Content-Encoding'] == second.headers['Content-Encoding'] == 'gzip'
+    assert first.headers['ETag'].endswith('-gzip"')
+    assert second.get_data() == first.get_data()
+    assert gzip.decompress(second.get_data()) == client.get('/donors').get_data()
+    assert (compression.compressed - compressed, compression.cache_hits - reused) == (1, 1)
+
+
+def test_variants_are_dropped_with_their_entry(client):
+    client.get('/donors', headers={'Accept-Encoding': 'gzip'})
+    bump_version('donors')
+    compressed = compression.compressed
+    client.get('/donors', headers={'Accept-Encoding': 'gzip'})
+    assert compression.compressed - compressed == 1
+
+
+def test_if_none_match_with_encoding_suffix(client):
+    etag = client.get('/donors', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    assert etag.endswith('-gzip"')
+    calls = client.application.calls
+
+    revalidated = client.get('/donors', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert client.application.calls == calls
+
+    bump_version('donors')
+    assert client.get('/donors', headers={'If-None-Match': etag}).status_code == 200
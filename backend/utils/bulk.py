@@ -0,0 +1,59 @@
+# utils/bulk.py
+"""Request handling shared by the ``/bulk`` endpoints of each blueprint."""
+from flask import current_app, jsonify, request
+
+from config.database import mongo
+from services.bulk import ItemError, summarize
+from utils.conditional import bump_version
+from utils.streaming import NDJSON_MIMETYPE
+
+WRITE_STATUSES = ('created', 'updated', 'deleted')
+
+
+class BulkBodyError(ValueError):
+    """Raised when a bulk request body is neither an array nor NDJSON."""
+
+
+def _iter_ndjson(stream):
+    loads = current_app.json.loads
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield loads(line)
+        except ValueError as e:
+            # Reported per item instead of failing the rows already written
+            yield ItemError(f"Line {line_number}: invalid JSON ({e})")
+
+
+def iter_request_items():
+    """Iterate the items of a bulk request body.
+
+    ``application/x-ndjson`` bodies are read line by line from the request
+    stream; anything else goes through ``get_json`` (JSON, MessagePack or
+    BSON) and must be an array, or an object with an ``items`` array.
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        return _iter_ndjson(request.stream)
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise BulkBodyError("Expected an array of items or an NDJSON body")
+    return iter(data)
+
+
+def bulk_request(operation, name, tracker=None):
+    """Run a ``services.bulk`` operation on collection ``name`` with the request items."""
+    chunk_size = current_app.config.get('BULK_CHUNK_SIZE', 500)
+    items = iter_request_items()
+    summary = None
+    try:
+        results = operation(mongo.db[name], items, chunk_size, tracker=tracker)
+        summary = summarize(results)
+    finally:
+        # Earlier chunks are committed even if a later one raised
+        if summary is None or any(status in summary for status in WRITE_STATUSES):
+            bump_version(name)
+    return jsonify({"results": results, "summary": summary}), 200
@@ -0,0 +1,125 @@
+# utils/compression.py
+"""Response compression negotiated from ``Accept-Encoding``.
+
+gzip is always available; brotli and zstd are offered when the ``brotli``
+and ``zstandard`` packages are installed. Bodies below
+``COMPRESS_MIN_SIZE`` are sent as-is. For responses served through
+``utils.response_cache`` the compressed body is stored next to the cache
+entry, keyed by its ETag and the encoding, so a cache hit is sent without
+rendering, hashing or compressing anything.
+"""
+import gzip
+
+from flask import request
+
+from utils.metrics import register_metrics
+from utils.response_cache import response_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/msgpack',
+    'application/x-msgpack',
+    'application/bson',
+    'text/html',
+    'text/plain',
+    'text/csv',
+}
+
+
+class Compression:
+
+    def __init__(self):
+        self.min_size = 1024
+        self.levels = {'gzip': 6, 'br': 4, 'zstd': 3}
+        self.algorithms = self._available(['br', 'zstd', 'gzip'])
+        self.compressed = 0
+        self.cache_hits = 0
+
+    def init_app(self, app):
+        config = app.config
+        self.min_size = config.get('COMPRESS_MIN_SIZE', 1024)
+        self.levels = {
+            'gzip': config.get('COMPRESS_GZIP_LEVEL', 6),
+            'br': config.get('COMPRESS_BR_LEVEL', 4),
+            'zstd': config.get('COMPRESS_ZSTD_LEVEL', 3),
+        }
+        self.algorithms = self._available(config.get('COMPRESS_ALGORITHMS', ['br', 'zstd', 'gzip']))
+        app.after_request(self.compress_response)
+        app.extensions['compression'] = self
+
+    @staticmethod
+    def _available(algorithms):
+        installed = {'gzip': True, 'br': brotli is not None, 'zstd': zstandard is not None}
+        return [name for name in algorithms if installed.get(name)]
+
+    def compress(self, data, encoding):
+        level = self.levels[encoding]
+        if encoding == 'br':
+            return brotli.compress(data, quality=level)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=level).compress(data)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def _compressed_body(self, response, encoding):
+        key = response_cache.current_key()
+        if key is not None:
+            body = response_cache.get_variant(key, encoding)
+            if body is not None:
+                self.cache_hits += 1
+                return body
+        body = self.compress(response.get_data(), encoding)
+        self.compressed += 1
+        if key is not None:
+            response_cache.set_variant(key, encoding, body)
+        return body
+
+    def compress_response(self, response):
+        response.vary.add('Accept-Encoding')
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        encoding = request.accept_encodings.best_match(self.algorithms)
+        if encoding is None:
+            return response
+
+        if (response.calculate_content_length() or 0) < self.min_size:
+            return response
+
+        response.set_data(self._compressed_body(response, encoding))
+        response.headers['Content-Encoding'] = encoding
+
+        # A strong validator must differ between encodings of the same entity
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+        return response
+
+    def stats(self):
+        return {
+            "algorithms": self.algorithms,
+            "min_size": self.min_size,
+            "compressed": self.compressed,
+            "cache_hits": self.cache_hits
+        }
+
+
+compression = Compression()
+register_metrics('compression', compression.stats)
@@ -0,0 +1,142 @@
+# utils/conditional.py
+"""Conditional GET backed by per-collection version counters.
+
+Every write handler calls ``bump_version`` for the collection it touched,
+which ``$inc``s a small counter document in ``collection_versions``. Read
+routes decorated with ``conditional`` derive their ETag from that counter
+and the request, so a matching ``If-None-Match`` (or ``If-Modified-Since``)
+is answered with ``304`` after a single ``_id`` lookup, without running the
+route's query. Writes made outside the API (imports, migrations) must bump
+the counter too, otherwise clients keep their cached copies.
+
+The bump is a separate round trip after the write: a single create, update
+or delete costs two (the write, which returns what the response needs, and
+the bump), and donor writes a third for ``services.inventory``. Folding them
+into one would need a multi-document transaction, which a standalone
+mongod does not offer.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import g, make_response, request
+
+from config.database import mongo
+from utils.formats import negotiated_format
+
+VERSIONS_COLLECTION = 'collection_versions'
+
+_write_listeners = []
+
+# Suffixes utils.compression appends to strong ETags of encoded responses
+_ENCODING_SUFFIXES = ('', '-gzip', '-br', '-zstd')
+
+
+def on_write(listener):
+    """Call ``listener(name)`` whenever ``bump_version(name)`` runs in this process."""
+    _write_listeners.append(listener)
+
+
+def bump_version(name):
+    """Record a write to collection ``name``; returns the new version."""
+    doc = mongo.db[VERSIONS_COLLECTION].find_one_and_update(
+        {"_id": name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+        return_document=True
+    )
+    for listener in _write_listeners:
+        listener(name)
+    return doc["version"]
+
+
+def collection_version(name):
+    """Return ``(version, updated_at)`` for ``name``; ``(0, None)`` if never written."""
+    doc = mongo.db[VERSIONS_COLLECTION].find_one({"_id": name})
+    if not doc:
+        return 0, None
+    updated_at = doc.get("updated_at")
+    if updated_at is not None and updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return doc["version"], updated_at
+
+
+def _etag(name, version, updated_at, extra=''):
+    # The representation depends on the path, query string and negotiated format
+    key = "\0".join([
+        name,
+        str(version),
+        updated_at.isoformat() if updated_at else '',
+        request.full_path,
+        negotiated_format(),
+        request.headers.get('Accept', ''),
+        extra,
+    ])
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def request_validators(name, vary=None):
+    """Return ``(etag, last_modified)`` of collection ``name`` for this request.
+
+    Looked up once per request, so stacked decorators share the same version.
+    ``vary()`` may return a string for responses that also change without a
+    write (e.g. as time passes); it is mixed into the ETag and disables
+    Last-Modified for that request.
+    """
+    validators = g.setdefault('_collection_validators', {})
+    if name not in validators:
+        version, updated_at = collection_version(name)
+        extra = vary() if vary else ''
+        last_modified = updated_at.replace(microsecond=0) if updated_at and not extra else None
+        validators[name] = (_etag(name, version, updated_at, extra), last_modified)
+    return validators[name]
+
+
+def _matched_etag(etag):
+    """Return the client's tag that matches ``etag`` in any content encoding."""
+    for suffix in _ENCODING_SUFFIXES:
+        if request.if_none_match.contains(etag + suffix):
+            return etag + suffix
+    return None
+
+
+def _not_modified(etag, last_modified):
+    response = make_response('', 304)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def conditional(name, vary=None):
+    """Add ETag/Last-Modified to a read route and answer revalidations with 304.
+
+    The version is read before the view runs, so a write racing the request
+    can only make the ETag older than the body, never newer; the client then
+    simply refetches on its next poll.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = request_validators(name, vary)
+
+            if request.if_none_match:
+                matched = _matched_etag(etag)
+                if matched:
+                    return _not_modified(matched, last_modified)
+            elif last_modified is not None and request.if_modified_since:
+                # HTTP dates have whole seconds: a write in the same second as
+                # the client's copy must not be answered with a 304
+                if last_modified < request.if_modified_since:
+                    return _not_modified(etag, last_modified)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,98 @@
+# utils/formats.py
+"""Content negotiation between JSON, MessagePack and BSON.
+
+Every ``jsonify`` response goes through ``NegotiatingJSONProvider``, which
+encodes the same payload as MessagePack when the client sends
+``Accept: application/msgpack`` or as BSON for ``Accept: application/bson``.
+``APIRequest.get_json`` accepts request bodies in the same formats, so route
+code does not change.
+"""
+import decimal
+from collections.abc import Mapping
+
+import bson
+import msgpack
+from bson.codec_options import CodecOptions, TypeRegistry
+from bson.raw_bson import RawBSONDocument
+from flask import Request, has_request_context, request
+
+from utils.serialization import ORJSONProvider, dumps, json_default
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+BSON_MIMETYPE = 'application/bson'
+
+_OFFERED = [JSON_MIMETYPE, *MSGPACK_MIMETYPES, BSON_MIMETYPE]
+
+
+def _bson_fallback(value):
+    if isinstance(value, decimal.Decimal):
+        return bson.Decimal128(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return value
+
+
+BSON_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry(fallback_encoder=_bson_fallback))
+
+# Lets list routes fetch documents as undecoded BSON for BSON responses
+RAW_BSON_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def negotiated_format():
+    """Return ``'json'``, ``'msgpack'`` or ``'bson'`` for the current request."""
+    if not has_request_context():
+        return 'json'
+    best = request.accept_mimetypes.best_match(_OFFERED, default=JSON_MIMETYPE)
+    if best in MSGPACK_MIMETYPES:
+        return 'msgpack'
+    if best == BSON_MIMETYPE:
+        return 'bson'
+    return 'json'
+
+
+def _msgpack_default(value):
+    # Same representation as the JSON payload (ISO dates, string ObjectIds)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, RawBSONDocument):
+        return dict(value)
+    return json_default(value)
+
+
+def encode(obj, fmt):
+    """Encode ``obj`` as ``fmt``; returns ``(body, mimetype)``."""
+    if fmt == 'msgpack':
+        return msgpack.packb(obj, default=_msgpack_default, datetime=False), MSGPACK_MIMETYPE
+    if fmt == 'bson' and isinstance(obj, Mapping):
+        # RawBSONDocuments inside obj are copied as-is, not re-encoded
+        return bson.encode(obj, codec_options=BSON_CODEC_OPTIONS), BSON_MIMETYPE
+    return dumps(obj), JSON_MIMETYPE
+
+
+class NegotiatingJSONProvider(ORJSONProvider):
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body, mimetype = encode(obj, negotiated_format())
+        response = self._app.response_class(body, mimetype=mimetype)
+        response.vary.add('Accept')
+        return response
+
+
+class APIRequest(Request):
+    """Request whose ``get_json`` also decodes MessagePack and BSON bodies."""
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if self.mimetype in MSGPACK_MIMETYPES or self.mimetype == BSON_MIMETYPE:
+            data = self.get_data(cache=cache)
+            try:
+                if self.mimetype == BSON_MIMETYPE:
+                    return bson.decode(data)
+                return msgpack.unpackb(data, raw=False)
+            except Exception as e:
+                if silent:
+                    return None
+                return self.on_json_loading_failure(e)
+        return super().get_json(force=force, silent=silent, cache=cache)
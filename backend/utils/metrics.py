@@ -0,0 +1,17 @@
+# utils/metrics.py
+"""In-process metrics registry served by the ``/metrics`` endpoint.
+
+Components register a callable returning a JSON-serializable dict; the
+endpoint reports whatever the current worker process has collected.
+"""
+
+_sources = {}
+
+
+def register_metrics(name, source):
+    """Expose ``source()`` under ``name`` in the metrics payload."""
+    _sources[name] = source
+
+
+def collect_metrics():
+    return {name: source() for name, source in _sources.items()}
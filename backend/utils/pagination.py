@@ -0,0 +1,98 @@
+# utils/pagination.py
+import base64
+import binascii
+
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from flask import current_app, request
+
+from services.bulk import without_claims
+from utils.formats import RAW_BSON_CODEC_OPTIONS, negotiated_format
+
+
+class PaginationError(ValueError):
+    """Raised when the ``limit`` or ``after`` query parameters are malformed."""
+
+
+def encode_cursor(object_id):
+    """Encode an ObjectId as an opaque, URL-safe cursor string."""
+    return base64.urlsafe_b64encode(ObjectId(object_id).binary).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by ``encode_cursor`` back into an ObjectId."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, InvalidId, TypeError, ValueError, UnicodeEncodeError):
+        raise PaginationError("Invalid cursor")
+
+
+def parse_page_args(args=None):
+    """Read ``limit`` and ``after`` from the query string.
+
+    Returns a ``(limit, after)`` tuple where ``after`` is an ObjectId or None.
+    """
+    args = request.args if args is None else args
+    default_limit = current_app.config.get('PAGINATION_DEFAULT_LIMIT', 50)
+    max_limit = current_app.config.get('PAGINATION_MAX_LIMIT', 500)
+
+    raw_limit = args.get('limit')
+    if raw_limit in (None, ''):
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise PaginationError("limit must be an integer")
+        if limit < 1:
+            raise PaginationError("limit must be positive")
+        limit = min(limit, max_limit)
+
+    raw_after = args.get('after')
+    after = decode_cursor(raw_after) if raw_after else None
+    return limit, after
+
+
+def paginate(collection, query=None, serializer=None, projection=None):
+    """Return one keyset page of ``collection`` ordered by ``_id``.
+
+    The page is fetched with an ``_id > after`` range predicate on the
+    primary index, so the cost of a page does not depend on how deep the
+    client has paged. One extra document is read to tell whether a next
+    page exists.
+
+    BSON responses skip ``serializer``; when one is given the server adds
+    the ``id`` alias that ``serialize_document`` would, so every format
+    carries the same fields.
+    """
+    limit, after = parse_page_args()
+
+    criteria = dict(query or {})
+    if after is not None:
+        criteria['_id'] = {'$gt': after}
+    projection = without_claims(projection)
+
+    if negotiated_format() == 'bson':
+        # BSON clients get the server's bytes back without a decode/re-encode
+        pipeline = [{"$match": criteria}, {"$sort": {"_id": 1}}, {"$limit": limit + 1}, {"$project": projection}]
+        if serializer is not None:
+            pipeline.append({"$addFields": {"id": "$_id"}})
+            serializer = None
+        raw = collection.with_options(codec_options=RAW_BSON_CODEC_OPTIONS)
+        docs = list(raw.aggregate(pipeline))
+    else:
+        docs = list(collection.find(criteria, projection).sort('_id', 1).limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    # Build the cursor before serializing, which may stringify ``_id``
+    next_cursor = encode_cursor(docs[-1]['_id']) if has_more else None
+    if serializer is not None:
+        docs = [serializer(doc) for doc in docs]
+
+    return {
+        "items": docs,
+        "next_cursor": next_cursor,
+        "limit": limit
+    }
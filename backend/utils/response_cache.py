@@ -0,0 +1,234 @@
+# utils/response_cache.py
+"""Response cache for read-heavy GET routes.
+
+Entries are keyed by the ETag ``utils.conditional`` derives for the request,
+and that ETag embeds the collection's write version. A write made through any
+worker therefore moves every reader to new keys at once; the old entries are
+never served again and are dropped locally when ``bump_version`` runs here,
+or left to expire by TTL elsewhere. A hit costs the single version lookup and
+no route query.
+
+By default entries live in a per-process LRU bounded by entry count, total
+bytes and TTL. With ``RESPONSE_CACHE_REDIS_URL`` set they are stored in a
+Redis-compatible server instead, so one worker's fill serves all of them.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import msgpack
+from flask import current_app, g, make_response, request
+
+from utils.conditional import on_write, request_validators
+from utils.metrics import register_metrics
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+# Set again by utils.conditional, recomputed by Werkzeug, or per-request
+_SKIPPED_HEADERS = {'etag', 'last-modified', 'cache-control', 'content-length', 'set-cookie', 'x-cache'}
+
+
+class MemoryBackend:
+    """LRU with per-entry TTL and a cap on the total size of stored bodies."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + ttl, value)
+            self.bytes += len(value)
+            while self._data and (len(self._data) > self.max_entries or self.bytes > self.max_bytes):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def _pop(self, key):
+        _, value = self._data.pop(key)
+        self.bytes -= len(value)
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions
+        }
+
+
+class RedisBackend:
+    """Entries shared through a Redis-compatible server; errors count as misses."""
+
+    name = 'redis'
+
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_REDIS_URL is set but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.errors = 0
+
+    def get(self, key):
+        try:
+            return self.client.get(key)
+        except redis.RedisError:
+            self.errors += 1
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(key, value, px=max(1, int(ttl * 1000)))
+        except redis.RedisError:
+            self.errors += 1
+
+    def delete_prefix(self, prefix):
+        # Superseded entries are unreachable once the version moves; the TTL reclaims them
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"errors": self.errors}
+
+
+class ResponseCache:
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.enabled = True
+        self.ttl = 30
+        self.max_item_bytes = 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        on_write(self.invalidate)
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config.get('RESPONSE_CACHE_ENABLED', True)
+        self.ttl = config.get('RESPONSE_CACHE_TTL', 30)
+        self.max_item_bytes = config.get('RESPONSE_CACHE_MAX_ITEM_BYTES', 1024 * 1024)
+        url = config.get('RESPONSE_CACHE_REDIS_URL')
+        if url:
+            self.backend = RedisBackend(url)
+        else:
+            self.backend = MemoryBackend(
+                config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024),
+                config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+            )
+        app.extensions['response_cache'] = self
+
+    def invalidate(self, name):
+        """Drop this process's entries for collection ``name``."""
+        self.invalidations += 1
+        self.backend.delete_prefix(f"response:{name}:")
+
+    def _key(self, name):
+        etag, _ = request_validators(name)
+        return f"response:{name}:{etag}"
+
+    def _load(self, key):
+        payload = self.backend.get(key)
+        if payload is None:
+            return None
+        status, headers, body = msgpack.unpackb(payload)
+        response = current_app.response_class(body, status=status, headers=headers)
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def _store(self, key, response):
+        """Cache ``response`` under ``key``; returns whether it was stored."""
+        if response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+            return False
+        body = response.get_data()
+        if len(body) > self.max_item_bytes:
+            return False
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS]
+        self.backend.set(key, msgpack.packb([response.status_code, headers, body]), self.ttl)
+        return True
+
+    def current_key(self):
+        """Cache key of the response being served, if it is (or now is) cached."""
+        return g.get('_response_cache_key')
+
+    def get_variant(self, key, encoding):
+        """Stored ``encoding`` (e.g. ``'gzip'``) of the body cached under ``key``."""
+        return self.backend.get(f"{key}:{encoding}")
+
+    def set_variant(self, key, encoding, body):
+        # Same prefix as the entry, so invalidation drops the variants with it
+        self.backend.set(f"{key}:{encoding}", body, self.ttl)
+
+    def cached(self, name):
+        """Serve a GET route from the cache until collection ``name`` is written."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return view(*args, **kwargs)
+                key = self._key(name)
+                response = self._load(key)
+                if response is not None:
+                    self.hits += 1
+                    g._response_cache_key = key
+                    return response
+                self.misses += 1
+                response = make_response(view(*args, **kwargs))
+                if self._store(key, response):
+                    g._response_cache_key = key
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.stats()
+        }
+
+
+response_cache = ResponseCache()
+cached = response_cache.cached
+register_metrics('response_cache', response_cache.stats)
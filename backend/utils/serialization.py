@@ -0,0 +1,63 @@
+# utils/serialization.py
+"""Shared BSON -> JSON serialization for every blueprint.
+
+Documents are not walked in Python to convert values. ``serialize_document``
+only adds the ``id`` alias. ``ObjectId``, ``datetime``, ``Decimal128`` and
+the rest are converted by orjson (natively or through ``json_default``)
+when the response is encoded, at any nesting depth.
+"""
+import decimal
+
+import orjson
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def json_default(value):
+    """Encode the BSON and stdlib types orjson does not handle natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_document(doc):
+    """Add an ``id`` field mirroring ``_id``; other values are encoded on dump."""
+    if not doc:
+        return doc
+    if "_id" in doc:
+        doc["id"] = doc["_id"]
+    return doc
+
+
+def dumps(obj):
+    return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by ``jsonify`` and ``request.get_json``."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes straight to the response, no str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,41 @@
+# utils/streaming.py
+from flask import Response, current_app, request, stream_with_context
+
+from services.bulk import without_claims
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_stream():
+    """True when the client asked for an NDJSON stream.
+
+    Either ``?stream=1`` or an ``Accept`` header that prefers
+    ``application/x-ndjson`` over plain JSON selects streaming mode.
+    """
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def ndjson_response(collection, query=None, serializer=None, projection=None):
+    """Stream every matching document as newline-delimited JSON.
+
+    Documents are pulled from the PyMongo cursor ``STREAM_BATCH_SIZE`` at a
+    time and serialized one by one, so memory use stays flat no matter how
+    large the collection is.
+    """
+    batch_size = current_app.config.get('STREAM_BATCH_SIZE', 1000)
+    cursor = collection.find(query or {}, without_claims(projection), batch_size=batch_size)
+
+    def generate():
+        dumps = current_app.json.dumps
+        try:
+            for doc in cursor:
+                if serializer is not None:
+                    doc = serializer(doc)
+                yield dumps(doc) + '\n'
+        finally:
+            cursor.close()
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)